@@ -2,20 +2,54 @@ import os
 import sys
 import csv
 import statistics
+import numpy as np
 from collections import Counter, defaultdict
+from dataclasses import dataclass, fields
 from datetime import timedelta
-from utils import safe_float
+from functools import lru_cache
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 """
 This program provides a report on the resource request and usage for a cluster
 
 """
 
+# numeric job attributes used by the report
+JOB_COLUMNS = [
+    "RequestMemory", "ResidentSetSize_RAW",
+    "RequestDisk", "DiskUsage_RAW",
+    "RequestCpus", "RequestGpus",
+    "RemoteUserCpu", "RemoteSysCpu", "RemoteWallClockTime",
+]
+
+
+# bar strings are sliced from these instead of being rebuilt on every call
+_BAR_FULL = "█" * 200
+_BAR_EMPTY = " " * 200
+
+# directory holding the per-cluster CSVs written by fetch_cluster_data.py
+_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cluster_data")
+
 
 # to print the bar visualizations
 def bar(pct, width=50):
     filled = int(pct / 100 * width)
-    return "[" + "█" * filled + " " * (width - filled) + f"] {pct:.1f}%"
+    return f"[{_BAR_FULL[:filled]}{_BAR_EMPTY[:max(0, width - filled)]}] {pct:.1f}%"
 
 # to calculate efficiency
 def efficiency(used, expected):
@@ -29,30 +63,48 @@ def calculate_waste(requested, used):
         return 0.0
     return max(0, requested - used)
 
+# linearly interpolated quantile (0 <= q <= 1) found with np.partition instead of a full sort
+def _quantile_fast(arr, q):
+    arr = np.asarray(arr, dtype=np.float64)
+    k = (arr.size - 1) * q
+    f = int(k)
+    if f + 1 >= arr.size:
+        return float(arr.max())
+    part = np.partition(arr, [f, f + 1])
+    return float(part[f] + (k - f) * (part[f + 1] - part[f]))
+
+# quantile (0 <= q <= 1) of an already sorted array, interpolated like np.quantile
+def _quantile_sorted(s, q):
+    k = (len(s) - 1) * q
+    f = int(k)
+    if f + 1 >= len(s):
+        return float(s[-1])
+    return float(s[f] + (k - f) * (s[f + 1] - s[f]))
+
+# median of an already sorted array
+def _median_sorted(s):
+    return _quantile_sorted(s, 0.5)
+
 # to get percentile value
 def percentile(data, p):
-    if not data:
+    if len(data) == 0:
         return 0
-    sorted_data = sorted(data)
-    k = (len(sorted_data) - 1) * p / 100
-    f = int(k)
-    c = f + 1
-    if c >= len(sorted_data):
-        return sorted_data[-1]
-    return sorted_data[f] + (k - f) * (sorted_data[c] - sorted_data[f])
+    return _quantile_fast(data, p / 100)
 
 # to print the usage report
 def compute_usage_summary(data, label, percentage=False, unit=None):
-    if not data or len(data) < 2:
+    if len(data) < 2:
         return f"{label:<25}: Not enough data"
 
-    data_sorted = sorted(data)
-    min_val = data_sorted[0]
-    q1 = statistics.quantiles(data_sorted, n=4)[0]
-    median = statistics.median(data_sorted)
-    q3 = statistics.quantiles(data_sorted, n=4)[2]
-    max_val = data_sorted[-1]
-    std_dev = statistics.stdev(data_sorted)
+    # min, Q1, median, Q3 and max from a single partitioning pass
+    # ("weibull" matches the exclusive quantile method of the statistics module
+    # from three values on; with two, statistics extrapolates the quartiles
+    # past min and max where weibull clamps them, so it is used directly)
+    arr = np.asarray(data, dtype=np.float64)
+    min_val, q1, median, q3, max_val = np.quantile(arr, [0.0, 0.25, 0.5, 0.75, 1.0], method="weibull")
+    if arr.size == 2:
+        q1, _, q3 = statistics.quantiles(arr.tolist(), n=4)
+    std_dev = arr.std(ddof=1)
     
     fmt = "{:.1f}%" if percentage else "{:.1f}"
     return (
@@ -63,7 +115,7 @@ def compute_usage_summary(data, label, percentage=False, unit=None):
 
 # prints the resource request table
 def print_resource_table(name, values, unit=""):
-    if not values:
+    if len(values) == 0:
         print(f"{name:<15}: No data")
         return
 
@@ -75,10 +127,11 @@ def print_resource_table(name, values, unit=""):
 
 # prints distribution of jobs by actual resource usage as a histogram
 def print_usage_distribution(name, used_list, unit="GiB"):
-    if not used_list:
+    if len(used_list) == 0:
         return
     
-    max_val = max(used_list)
+    arr = np.asarray(used_list, dtype=np.float64)
+    max_val = arr.max()
     
     # Define bins based on the data range
     if max_val <= 10:
@@ -92,41 +145,37 @@ def print_usage_distribution(name, used_list, unit="GiB"):
         labels = ["0-10", "10-25", "25-50", "50-100", "100+"]
     
     # Count jobs in each bin
-    bin_counts = [0] * len(labels)
-    for val in used_list:
-        for i in range(len(bins) - 1):
-            if bins[i] <= val < bins[i+1]:
-                bin_counts[i] += 1
-                break
+    bin_counts = np.histogram(arr, bins=bins)[0]
     
-    total_jobs = len(used_list)
+    total_jobs = len(arr)
     
     print(f"\n{name} Distribution:")
     
-    # Find max count for scaling
-    max_count = max(bin_counts) if bin_counts else 1
+    # Scale every bar against the fullest bin in one vectorized step
+    max_count = max(bin_counts.max(), 1)
     bar_width = 50
-    
-    for i, (label, count) in enumerate(zip(labels, bin_counts)):
-        if count > 0:
-            pct = (count / total_jobs) * 100
-            # Create histogram bar
-            bar_length = int((count / max_count) * bar_width)
-            bar_visual = "█" * bar_length
-            print(f"  {label:>10} {unit}: {bar_visual:<{bar_width}} {count:>4} ({pct:>5.1f}%)")
-        else:
-            # Show empty bins if they exist
-            print(f"  {label:>10} {unit}: {'':<{bar_width}} {count:>4} (  0.0%)")
+    pcts = bin_counts / total_jobs * 100
+    bar_lens = bin_counts * bar_width // max_count
+
+    lines = [
+        f"  {label:>10} {unit}: {_BAR_FULL[:bar_len]:<{bar_width}} {count:>4} ({pct:>5.1f}%)"
+        for label, bar_len, count, pct in zip(labels, bar_lens, bin_counts, pcts)
+    ]
+    print("\n".join(lines))
 
 # print recommendations
 def print_recommendations(mem_req, mem_used, disk_req, disk_used, cpu_req, cpu_used_pct, avg_runtime_hours):
     print(f"\n{'Resource Optimization Recommendations':^80}")
     print("=" * 80)
+
+    mem_req, mem_used = np.asarray(mem_req, dtype=np.float64), np.asarray(mem_used, dtype=np.float64)
+    disk_req, disk_used = np.asarray(disk_req, dtype=np.float64), np.asarray(disk_used, dtype=np.float64)
+    cpu_req, cpu_used_pct = np.asarray(cpu_req, dtype=np.float64), np.asarray(cpu_used_pct, dtype=np.float64)
     
-    if mem_req and mem_used:
-        p95_mem = percentile(mem_used, 95)
+    if len(mem_req) and len(mem_used):
+        p95_mem = _quantile_fast(mem_used, 0.95)
         recommended_mem = p95_mem * 1.1  # 10% buffer
-        median_mem_req = statistics.median(mem_req)
+        median_mem_req = np.median(mem_req)
         
         if recommended_mem < median_mem_req * 0.8:  # If we can save >20%
             savings = (median_mem_req - recommended_mem) * len(mem_used) * avg_runtime_hours
@@ -136,10 +185,10 @@ def print_recommendations(mem_req, mem_used, disk_req, disk_used, cpu_req, cpu_u
             print(f"  Potential Savings   : {savings:.1f} GiB-hours")
             print(f"  Jobs Affected       : {len(mem_used)}")
     
-    if disk_req and disk_used:
-        p95_disk = percentile(disk_used, 95)
+    if len(disk_req) and len(disk_used):
+        p95_disk = _quantile_fast(disk_used, 0.95)
         recommended_disk = p95_disk * 1.2  # 20% buffer for disk
-        median_disk_req = statistics.median(disk_req)
+        median_disk_req = np.median(disk_req)
         
         if recommended_disk < median_disk_req * 0.8:
             savings = (median_disk_req - recommended_disk) * len(disk_used) * avg_runtime_hours
@@ -149,9 +198,9 @@ def print_recommendations(mem_req, mem_used, disk_req, disk_used, cpu_req, cpu_u
             print(f"  Potential Savings   : {savings:.1f} GiB-hours")
             print(f"  Jobs Affected       : {len(disk_used)}")
     
-    if cpu_req and cpu_used_pct:
-        median_cpu_pct = statistics.median(cpu_used_pct)
-        median_cpu_req = statistics.median(cpu_req)
+    if len(cpu_req) and len(cpu_used_pct):
+        median_cpu_pct = np.median(cpu_used_pct)
+        median_cpu_req = np.median(cpu_req)
         
         if median_cpu_pct < 50:
             # Calculate recommended CPUs based on actual usage
@@ -164,92 +213,308 @@ def print_recommendations(mem_req, mem_used, disk_req, disk_used, cpu_req, cpu_u
             print(f"  Recommended         : {recommended_cpus} CPUs")
             print(f"  Jobs Affected       : {len(cpu_used_pct)}")
 
-# prints the total report
-def summarize(cluster_id):
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, "cluster_data")
-    filepath = os.path.join(data_dir, f"cluster_{cluster_id}_jobs.csv")
+# path of the CSV written by fetch_cluster_data.py for a cluster
+def _job_csv_path(cluster_id):
+    return os.path.join(_DATA_DIR, f"cluster_{cluster_id}_jobs.csv")
+
+# loads the numeric job columns for a cluster as float64 arrays, blank or invalid values become NaN
+def _load_jobs(cluster_id):
+    filepath = _job_csv_path(cluster_id)
 
     if not os.path.exists(filepath):
-        print(f"Cluster Data not found, please make sure you have the correct .csv, filepath and the correct cluster id")
-        sys.exit(1)
+        return None
 
+    return _read_jobs(filepath)
+
+# reads the numeric job columns as float64 arrays, preferring pyarrow, then
+# pandas, then the csv/NumPy reader depending on what is installed
+def _read_jobs(filepath):
+    if pa is not None:
+        try:
+            return _read_job_columns_arrow(filepath)
+        except pa.ArrowInvalid:
+            # a cell arrow cannot parse as a number (e.g. an unevaluated
+            # expression); the readers below coerce those to NaN instead
+            pass
+
+    if pd is None:
+        return _read_job_columns_csv(filepath)
+
+    df = pd.read_csv(filepath, usecols=lambda c: c in JOB_COLUMNS, engine="c")
+    # columns absent from older CSVs are added as all-NaN
+    df = df.reindex(columns=JOB_COLUMNS).apply(pd.to_numeric, errors="coerce")
+    return {name: df[name].to_numpy(dtype=np.float64) for name in JOB_COLUMNS}
+
+# pyarrow reader: multithreaded parsing straight into columnar buffers
+def _read_job_columns_arrow(filepath):
+    table = pacsv.read_csv(
+        filepath,
+        # HoldReason and Args can contain quoted newlines
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: pa.float64() for name in JOB_COLUMNS},
+            include_columns=JOB_COLUMNS,
+            include_missing_columns=True,
+            null_values=["", "undefined", "UNDEFINED"],
+            strings_can_be_null=True,
+        ),
+    )
+    return {
+        name: table[name].cast(pa.float64()).to_numpy(zero_copy_only=False)
+        for name in JOB_COLUMNS
+    }
+
+# NumPy fallback for _read_jobs when neither pyarrow nor pandas is installed
+def _read_job_columns_csv(filepath):
     with open(filepath, newline='', encoding='utf-8') as f:
-        jobs = list(csv.DictReader(f))
-
-    mem_requested, mem_used = [], []
-    disk_requested, disk_used = [], []
-    run_time, cpu_used_time = [], []
-    runtimes = []
-    cpu_requests = []
-    gpu_requests = []
-
-    for job in jobs:
-        mem_req = safe_float(job.get("RequestMemory"))
-        mem_use = safe_float(job.get("ResidentSetSize_RAW"))
-        if mem_req:
-            mem_requested.append(round(mem_req / 1024, 2))  # Convert MiB to GiB
-        if mem_use:
-            mem_used.append(mem_use / 1024 / 1024)  # Convert KiB to GiB
-
-        disk_req = safe_float(job.get("RequestDisk"))
-        disk_use = safe_float(job.get("DiskUsage_RAW"))
-        if disk_req:
-            disk_requested.append(round(disk_req / (1024 * 1024), 2))  # Convert KiB to GiB
-        if disk_use:
-            disk_used.append(disk_use / (1024 * 1024))  # Convert KiB to GiB
-
-        cpus = safe_float(job.get("RequestCpus"))
-        if cpus:
-            cpu_requests.append(int(cpus))
-
-        gpus = safe_float(job.get("RequestGpus"))
-        if gpus:
-            gpu_requests.append(int(gpus))
-
-        user_cpu = safe_float(job.get("RemoteUserCpu")) or 0
-        sys_cpu = safe_float(job.get("RemoteSysCpu")) or 0
-        wall_time = safe_float(job.get("RemoteWallClockTime"))
-
-        if wall_time and cpus and (user_cpu or sys_cpu):
-            total_cpu_used = sys_cpu / cpus
-            cpu_used_time.append(total_cpu_used)
-            run_time.append(wall_time)
-
-        if wall_time:
-            runtimes.append(wall_time)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        index = {name: i for i, name in enumerate(header)}
+        present = [name for name in JOB_COLUMNS if name in index]
+        positions = [index[name] for name in present]
+        # csv.reader copes with the quoted multi-line fields (HoldReason, Args)
+        # that genfromtxt cannot, so only the numeric cells are passed through;
+        # a cell holding a comma (an unevaluated expression) is never a number.
+        # Each line starts with a dummy field so that a job whose only cell is
+        # blank still yields a line, as genfromtxt drops empty lines.
+        lines = [
+            "0," + ",".join(
+                row[i] if i < len(row) and "," not in row[i] else ""
+                for i in positions
+            )
+            for row in reader
+        ]
+
+    columns = {name: np.full(len(lines), np.nan) for name in JOB_COLUMNS}
+    if lines and present:
+        # blank and non-numeric cells (e.g. "undefined") come back as NaN
+        table = np.genfromtxt(
+            lines, delimiter=",", dtype=np.float64, ndmin=2, usecols=range(1, len(present) + 1)
+        )
+        for j, name in enumerate(present):
+            columns[name] = np.ascontiguousarray(table[:, j])
+    return columns
+
+
+# per-job arithmetic over the raw columns: GiB conversions and the CPU, memory
+# and disk efficiency of each job (NaN where the job has no usable value)
+def _aggregate_loop(mem_req_raw, mem_use_raw, disk_req_raw, disk_use_raw, cpus, user_cpu, sys_cpu, wall):
+    n = wall.size
+    mem_req = np.empty(n)
+    mem_use = np.empty(n)
+    disk_req = np.empty(n)
+    disk_use = np.empty(n)
+    cpu_eff = np.full(n, np.nan)
+    mem_eff = np.full(n, np.nan)
+    disk_eff = np.full(n, np.nan)
+
+    for i in range(n):
+        mem_req[i] = mem_req_raw[i] / 1024  # Convert MiB to GiB
+        mem_use[i] = mem_use_raw[i] / 1024 / 1024  # Convert KiB to GiB
+        disk_req[i] = disk_req_raw[i] / (1024 * 1024)  # Convert KiB to GiB
+        disk_use[i] = disk_use_raw[i] / (1024 * 1024)  # Convert KiB to GiB
+
+        user = 0.0 if np.isnan(user_cpu[i]) else user_cpu[i]
+        system = 0.0 if np.isnan(sys_cpu[i]) else sys_cpu[i]
+        if wall[i] > 0 and cpus[i] > 0 and user + system > 0:
+            cpu_eff[i] = system / cpus[i] / wall[i] * 100
+        if mem_req[i] > 0 and mem_use[i] > 0:
+            mem_eff[i] = mem_use[i] / mem_req[i] * 100
+        if disk_req[i] > 0 and disk_use[i] > 0:
+            disk_eff[i] = disk_use[i] / disk_req[i] * 100
+
+    return mem_req, mem_use, disk_req, disk_use, cpu_eff, mem_eff, disk_eff
+
+# same computation as _aggregate_loop with whole-array NumPy operations
+def _aggregate_numpy(mem_req_raw, mem_use_raw, disk_req_raw, disk_use_raw, cpus, user_cpu, sys_cpu, wall):
+    mem_req = mem_req_raw / 1024  # Convert MiB to GiB
+    mem_use = mem_use_raw / 1024 / 1024  # Convert KiB to GiB
+    disk_req = disk_req_raw / (1024 * 1024)  # Convert KiB to GiB
+    disk_use = disk_use_raw / (1024 * 1024)  # Convert KiB to GiB
+
+    user = np.nan_to_num(user_cpu)
+    system = np.nan_to_num(sys_cpu)
+    has_cpu = (wall > 0) & (cpus > 0) & ((user + system) > 0)
+    cpu_eff = np.full(wall.size, np.nan)
+    cpu_eff[has_cpu] = system[has_cpu] / cpus[has_cpu] / wall[has_cpu] * 100
+
+    has_mem = (mem_req > 0) & (mem_use > 0)
+    mem_eff = np.full(wall.size, np.nan)
+    mem_eff[has_mem] = mem_use[has_mem] / mem_req[has_mem] * 100
+
+    has_disk = (disk_req > 0) & (disk_use > 0)
+    disk_eff = np.full(wall.size, np.nan)
+    disk_eff[has_disk] = disk_use[has_disk] / disk_req[has_disk] * 100
+
+    return mem_req, mem_use, disk_req, disk_use, cpu_eff, mem_eff, disk_eff
+
+# compiled once and cached on disk when numba is installed
+_aggregate = njit(cache=True)(_aggregate_loop) if njit is not None else _aggregate_numpy
+
+
+# derived per-cluster arrays (sorted ascending) and scalars shared by summarize() and get_analytics_data()
+@dataclass(frozen=True)
+class Metrics:
+    total_jobs: int
+    mem_requested: np.ndarray
+    mem_used: np.ndarray
+    disk_requested: np.ndarray
+    disk_used: np.ndarray
+    cpu_requests: np.ndarray
+    gpu_requests: np.ndarray
+    runtimes: np.ndarray
+    per_job_cpu_eff: np.ndarray
+    per_job_mem_eff: np.ndarray
+    per_job_disk_eff: np.ndarray
+    avg_cpu_eff: float
+    avg_mem_eff: float
+    avg_disk_eff: float
+    avg_runtime: float
+    avg_runtime_hours: float
+    savings: dict
+
+    def __post_init__(self):
+        # results are cached, so keep callers from mutating the shared arrays
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+
+
+# computes the metrics for a cluster, reusing the previous result while the CSV is unchanged
+def _compute_metrics(cluster_id):
+    filepath = _job_csv_path(cluster_id)
 
-    
+    if not os.path.exists(filepath):
+        return None
 
-    # Compute per-job efficiency lists
-    per_job_cpu_eff = [
-        efficiency(cpu_used_time[i], run_time[i])
-        for i in range(len(cpu_used_time))
-        if run_time[i]
-    ]
+    return _compute_metrics_cached(str(cluster_id), os.stat(filepath).st_mtime_ns)
 
-    per_job_mem_eff = [
-        efficiency(mem_used[i], mem_requested[i])
-        for i in range(min(len(mem_used), len(mem_requested)))
-        if mem_requested[i]
-    ]
 
-    per_job_disk_eff = [
-        efficiency(disk_used[i], disk_requested[i])
-        for i in range(min(len(disk_used), len(disk_requested)))
-        if disk_requested[i]
-    ]
+@lru_cache(maxsize=4)
+def _compute_metrics_cached(cluster_id, mtime_ns):
+    jobs = _load_jobs(cluster_id)
+
+    if jobs is None:
+        return None
+
+    cpus = jobs["RequestCpus"]
+    wall_time = jobs["RemoteWallClockTime"]
+    mem_req, mem_use, disk_req, disk_use, cpu_eff, mem_eff, disk_eff = _aggregate(
+        jobs["RequestMemory"], jobs["ResidentSetSize_RAW"],
+        jobs["RequestDisk"], jobs["DiskUsage_RAW"],
+        cpus, jobs["RemoteUserCpu"], jobs["RemoteSysCpu"], wall_time,
+    )
+
+    mem_requested = np.round(mem_req[mem_req > 0], 2)
+    mem_used = mem_use[mem_use > 0]
+    disk_requested = np.round(disk_req[disk_req > 0], 2)
+    disk_used = disk_use[disk_use > 0]
+
+    cpu_requests = cpus[cpus > 0].astype(int)
+    gpus = jobs["RequestGpus"]
+    gpu_requests = gpus[gpus > 0].astype(int)
+    runtimes = wall_time[wall_time > 0]
+
+    per_job_cpu_eff = cpu_eff[~np.isnan(cpu_eff)]
+    per_job_mem_eff = mem_eff[~np.isnan(mem_eff)]
+    per_job_disk_eff = disk_eff[~np.isnan(disk_eff)]
+
+    # None of these arrays line up with job rows any more, so sort each one once
+    # in place and read every median/percentile below from the sorted data
+    for values in (mem_requested, mem_used, disk_requested, disk_used, cpu_requests,
+                   per_job_cpu_eff, per_job_mem_eff, per_job_disk_eff):
+        values.sort()
 
     # Take medians
-    avg_cpu_eff = statistics.median(per_job_cpu_eff) if per_job_cpu_eff else 0
-    avg_mem_eff = statistics.median(per_job_mem_eff) if per_job_mem_eff else 0
-    avg_disk_eff = statistics.median(per_job_disk_eff) if per_job_disk_eff else 0
+    avg_cpu_eff = _median_sorted(per_job_cpu_eff) if len(per_job_cpu_eff) else 0
+    avg_mem_eff = _median_sorted(per_job_mem_eff) if len(per_job_mem_eff) else 0
+    avg_disk_eff = _median_sorted(per_job_disk_eff) if len(per_job_disk_eff) else 0
+
+    avg_runtime = runtimes.mean() if len(runtimes) else 0
+    avg_runtime_hours = avg_runtime / 3600 if avg_runtime else 1.0
 
+    # Calculate savings
+    savings = {}
+    
+    if len(mem_requested) and len(mem_used):
+        p95_mem = _quantile_sorted(mem_used, 0.95)
+        recommended_mem = p95_mem * 1.1
+        median_mem_req = _median_sorted(mem_requested)
+        
+        if recommended_mem < median_mem_req * 0.8:
+            mem_savings = (median_mem_req - recommended_mem) * len(mem_used) * avg_runtime_hours
+            savings["memory"] = {
+                "current": median_mem_req,
+                "recommended": recommended_mem,
+                "savings_gib_hours": mem_savings,
+                "reduction_pct": ((median_mem_req - recommended_mem) / median_mem_req) * 100
+            }
     
-    total_jobs = len(jobs)
-    avg_runtime = statistics.mean(runtimes) if runtimes else 0
+    if len(disk_requested) and len(disk_used):
+        p95_disk = _quantile_sorted(disk_used, 0.95)
+        recommended_disk = p95_disk * 1.2
+        median_disk_req = _median_sorted(disk_requested)
+        
+        if recommended_disk < median_disk_req * 0.8:
+            disk_savings = (median_disk_req - recommended_disk) * len(disk_used) * avg_runtime_hours
+            savings["disk"] = {
+                "current": median_disk_req,
+                "recommended": recommended_disk,
+                "savings_gib_hours": disk_savings,
+                "reduction_pct": ((median_disk_req - recommended_disk) / median_disk_req) * 100
+            }
+    
+    if len(cpu_requests) and len(per_job_cpu_eff):
+        median_cpu_pct = avg_cpu_eff
+        median_cpu_req = _median_sorted(cpu_requests)
+        
+        if median_cpu_pct < 50:
+            recommended_cpus = max(1, int(median_cpu_req * (median_cpu_pct / 100) * 1.2))
+            savings["cpu"] = {
+                "current": median_cpu_req,
+                "recommended": recommended_cpus,
+                "current_efficiency": median_cpu_pct,
+            }
+
+    return Metrics(
+        total_jobs=len(wall_time),
+        mem_requested=mem_requested,
+        mem_used=mem_used,
+        disk_requested=disk_requested,
+        disk_used=disk_used,
+        cpu_requests=cpu_requests,
+        gpu_requests=gpu_requests,
+        runtimes=runtimes,
+        per_job_cpu_eff=per_job_cpu_eff,
+        per_job_mem_eff=per_job_mem_eff,
+        per_job_disk_eff=per_job_disk_eff,
+        avg_cpu_eff=avg_cpu_eff,
+        avg_mem_eff=avg_mem_eff,
+        avg_disk_eff=avg_disk_eff,
+        avg_runtime=avg_runtime,
+        avg_runtime_hours=avg_runtime_hours,
+        savings=savings,
+    )
+
+# prints the total report
+def summarize(cluster_id):
+    metrics = _compute_metrics(cluster_id)
+
+    if metrics is None:
+        print(f"Cluster Data not found, please make sure you have the correct .csv, filepath and the correct cluster id")
+        sys.exit(1)
+
+    mem_requested, mem_used = metrics.mem_requested, metrics.mem_used
+    disk_requested, disk_used = metrics.disk_requested, metrics.disk_used
+    cpu_requests, gpu_requests = metrics.cpu_requests, metrics.gpu_requests
+    per_job_cpu_eff = metrics.per_job_cpu_eff
+    avg_cpu_eff, avg_mem_eff, avg_disk_eff = metrics.avg_cpu_eff, metrics.avg_mem_eff, metrics.avg_disk_eff
+
+    total_jobs = metrics.total_jobs
+    avg_runtime = metrics.avg_runtime
     avg_runtime_str = str(timedelta(seconds=int(avg_runtime))) if avg_runtime else "N/A"
-    avg_runtime_hours = avg_runtime / 3600 if avg_runtime else 1.0
+    avg_runtime_hours = metrics.avg_runtime_hours
 
     print("=" * 80)
     print(f"{'HTCondor Cluster Resource Summary':^80}")
@@ -271,20 +536,9 @@ def summarize(cluster_id):
     print(f"{'Resource (units)':<25}: {'Min':>6}  {'Q1':>6}  {'Median':>7}  {'Q3':>6}  {'Max':>6}   {'StdDev':>6}")
     print("-" * 80)
 
-    cpu_usages, mem_values, disk_values = [], [], []
-
-    for i in range(len(jobs)):
-        if i < len(cpu_used_time) and i < len(run_time) and run_time[i]:
-            cpu_usages.append(efficiency(cpu_used_time[i], run_time[i]))
-        if i < len(mem_used):
-            mem_values.append(mem_used[i])
-        if i < len(disk_used):
-            disk_values.append(disk_used[i])
-
-
-    print(compute_usage_summary(mem_values, "Memory Used (GiB)"))
-    print(compute_usage_summary(disk_values, "Disk Used (GiB)"))
-    print(compute_usage_summary(cpu_usages, "CPU Usage (%)", percentage=True))
+    print(compute_usage_summary(mem_used, "Memory Used (GiB)"))
+    print(compute_usage_summary(disk_used, "Disk Used (GiB)"))
+    print(compute_usage_summary(per_job_cpu_eff, "CPU Usage (%)", percentage=True))
     
 
     print()
@@ -304,7 +558,7 @@ def summarize(cluster_id):
     
     # Recommendations
     print_recommendations(mem_requested, mem_used, disk_requested, disk_used, 
-                         cpu_requests, cpu_usages, avg_runtime_hours)
+                         cpu_requests, per_job_cpu_eff, avg_runtime_hours)
 
     # Gives human readable notes on the efficiency and also warnings
     print()
@@ -339,145 +593,28 @@ def get_analytics_data(cluster_id):
     Returns:
         dict: Dictionary containing all analytics metrics
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, "cluster_data")
-    filepath = os.path.join(data_dir, f"cluster_{cluster_id}_jobs.csv")
+    metrics = _compute_metrics(cluster_id)
 
-    if not os.path.exists(filepath):
+    if metrics is None:
         return None
 
-    with open(filepath, newline='', encoding='utf-8') as f:
-        jobs = list(csv.DictReader(f))
-
-    mem_requested, mem_used = [], []
-    disk_requested, disk_used = [], []
-    run_time, cpu_used_time = [], []
-    runtimes = []
-    cpu_requests = []
-    gpu_requests = []
-
-    for job in jobs:
-        mem_req = safe_float(job.get("RequestMemory"))
-        mem_use = safe_float(job.get("ResidentSetSize_RAW"))
-        if mem_req:
-            mem_requested.append(round(mem_req / 1024, 2))
-        if mem_use:
-            mem_used.append(mem_use / 1024 / 1024)
-
-        disk_req = safe_float(job.get("RequestDisk"))
-        disk_use = safe_float(job.get("DiskUsage_RAW"))
-        if disk_req:
-            disk_requested.append(round(disk_req / (1024 * 1024), 2))
-        if disk_use:
-            disk_used.append(disk_use / (1024 * 1024))
-
-        cpus = safe_float(job.get("RequestCpus"))
-        if cpus:
-            cpu_requests.append(int(cpus))
-
-        gpus = safe_float(job.get("RequestGpus"))
-        if gpus:
-            gpu_requests.append(int(gpus))
-
-        user_cpu = safe_float(job.get("RemoteUserCpu")) or 0
-        sys_cpu = safe_float(job.get("RemoteSysCpu")) or 0
-        wall_time = safe_float(job.get("RemoteWallClockTime"))
-
-        if wall_time and cpus and (user_cpu or sys_cpu):
-            total_cpu_used = sys_cpu / cpus
-            cpu_used_time.append(total_cpu_used)
-            run_time.append(wall_time)
-
-        if wall_time:
-            runtimes.append(wall_time)
-
-    # Compute per-job efficiency lists
-    per_job_cpu_eff = [
-        efficiency(cpu_used_time[i], run_time[i])
-        for i in range(len(cpu_used_time))
-        if run_time[i]
-    ]
-
-    per_job_mem_eff = [
-        efficiency(mem_used[i], mem_requested[i])
-        for i in range(min(len(mem_used), len(mem_requested)))
-        if mem_requested[i]
-    ]
-
-    per_job_disk_eff = [
-        efficiency(disk_used[i], disk_requested[i])
-        for i in range(min(len(disk_used), len(disk_requested)))
-        if disk_requested[i]
-    ]
-
-    # Take medians
-    avg_cpu_eff = statistics.median(per_job_cpu_eff) if per_job_cpu_eff else 0
-    avg_mem_eff = statistics.median(per_job_mem_eff) if per_job_mem_eff else 0
-    avg_disk_eff = statistics.median(per_job_disk_eff) if per_job_disk_eff else 0
-
-    avg_runtime = statistics.mean(runtimes) if runtimes else 0
-    avg_runtime_hours = avg_runtime / 3600 if avg_runtime else 1.0
-
-    # Calculate savings
-    savings = {}
-    
-    if mem_requested and mem_used:
-        p95_mem = percentile(mem_used, 95)
-        recommended_mem = p95_mem * 1.1
-        median_mem_req = statistics.median(mem_requested)
-        
-        if recommended_mem < median_mem_req * 0.8:
-            mem_savings = (median_mem_req - recommended_mem) * len(mem_used) * avg_runtime_hours
-            savings["memory"] = {
-                "current": median_mem_req,
-                "recommended": recommended_mem,
-                "savings_gib_hours": mem_savings,
-                "reduction_pct": ((median_mem_req - recommended_mem) / median_mem_req) * 100
-            }
-    
-    if disk_requested and disk_used:
-        p95_disk = percentile(disk_used, 95)
-        recommended_disk = p95_disk * 1.2
-        median_disk_req = statistics.median(disk_requested)
-        
-        if recommended_disk < median_disk_req * 0.8:
-            disk_savings = (median_disk_req - recommended_disk) * len(disk_used) * avg_runtime_hours
-            savings["disk"] = {
-                "current": median_disk_req,
-                "recommended": recommended_disk,
-                "savings_gib_hours": disk_savings,
-                "reduction_pct": ((median_disk_req - recommended_disk) / median_disk_req) * 100
-            }
-    
-    if cpu_requests and per_job_cpu_eff:
-        median_cpu_pct = statistics.median(per_job_cpu_eff)
-        median_cpu_req = statistics.median(cpu_requests)
-        
-        if median_cpu_pct < 50:
-            recommended_cpus = max(1, int(median_cpu_req * (median_cpu_pct / 100) * 1.2))
-            savings["cpu"] = {
-                "current": median_cpu_req,
-                "recommended": recommended_cpus,
-                "current_efficiency": median_cpu_pct,
-            }
-
     return {
-        "total_jobs": len(jobs),
-        "avg_runtime": avg_runtime,
-        "avg_runtime_hours": avg_runtime_hours,
-        "memory_efficiency": avg_mem_eff,
-        "disk_efficiency": avg_disk_eff,
-        "cpu_efficiency": avg_cpu_eff,
-        "memory_jobs": len(per_job_mem_eff),
-        "disk_jobs": len(per_job_disk_eff),
-        "cpu_jobs": len(per_job_cpu_eff),
-        "mem_requested": mem_requested,
-        "mem_used": mem_used,
-        "disk_requested": disk_requested,
-        "disk_used": disk_used,
-        "cpu_requests": cpu_requests,
-        "cpu_efficiency_list": per_job_cpu_eff,
-        "savings": savings,
+        "total_jobs": metrics.total_jobs,
+        "avg_runtime": metrics.avg_runtime,
+        "avg_runtime_hours": metrics.avg_runtime_hours,
+        "memory_efficiency": metrics.avg_mem_eff,
+        "disk_efficiency": metrics.avg_disk_eff,
+        "cpu_efficiency": metrics.avg_cpu_eff,
+        "memory_jobs": len(metrics.per_job_mem_eff),
+        "disk_jobs": len(metrics.per_job_disk_eff),
+        "cpu_jobs": len(metrics.per_job_cpu_eff),
+        "mem_requested": metrics.mem_requested.tolist(),
+        "mem_used": metrics.mem_used.tolist(),
+        "disk_requested": metrics.disk_requested.tolist(),
+        "disk_used": metrics.disk_used.tolist(),
+        "cpu_requests": metrics.cpu_requests.tolist(),
+        "cpu_efficiency_list": metrics.per_job_cpu_eff.tolist(),
+        "savings": {k: dict(v) for k, v in metrics.savings.items()},
     }
 
 
@@ -1,7 +1,9 @@
 import os
 import csv
 import sys
+import tempfile
 import htcondor2
+from collections import Counter
 from datetime import datetime
 
 """
@@ -47,6 +49,34 @@ REQUIRED_PARAMS = [
     "EnteredCurrentStatus",
 ]
 
+# Attributes every job ad carries; the rest (GPUs, hold details, usage) are
+# legitimately absent on many jobs
+ALWAYS_PRESENT = (
+    "ClusterId", "ProcId", "JobStatus",
+    "RequestMemory", "RequestDisk", "RequestCpus",
+    "QDate", "EnteredCurrentStatus",
+)
+
+
+def job_row(ad, missing=None):
+    """
+    Build one CSV row (a tuple ordered like REQUIRED_PARAMS) from a job ad.
+    
+    The history/query projection already returns concrete values, and
+    attributes the ad does not have are written as blanks.
+    
+    Parameters:
+        ad (classad.ClassAd): A job ad from schedd.history() or schedd.query()
+        missing (set, optional): Collects any ALWAYS_PRESENT attribute the ad lacks
+    
+    Returns:
+        tuple: The attribute values in REQUIRED_PARAMS order
+    """
+    row = tuple(ad[param] if param in ad else "" for param in REQUIRED_PARAMS)
+    if missing is not None:
+        missing.update(param for param in ALWAYS_PRESENT if param not in ad)
+    return row
+
 
 def fetch_cluster_jobs(cluster_id, output_dir="cluster_data"):
     """
@@ -70,121 +100,118 @@ def fetch_cluster_jobs(cluster_id, output_dir="cluster_data"):
     print(f"Fetching jobs for cluster {cluster_id}...")
     print(f"This may take a moment for large clusters...\n")
     
-    jobs_data = []
     job_count = 0
+    status_index = REQUIRED_PARAMS.index("JobStatus")
+    raw_status_counts = Counter()
+    missing_params = set()
     
-    # Query history for completed jobs
-    print("Querying job history...", file=sys.stderr)
+    # Rows are written as they arrive instead of being collected first. They go to a
+    # temporary file beside the CSV that replaces it only once a job was fetched, so
+    # a failed fetch leaves any earlier CSV for this cluster intact.
     try:
-        for i, ad in enumerate(schedd.history(
-            constraint=f"ClusterId == {cluster_id}",
-            projection=REQUIRED_PARAMS,
-            match=-1
-        )):
-            job_dict = {}
-            for param in REQUIRED_PARAMS:
-                try:
-                    # Use .get() for safer access, with fallback to eval()
-                    value = ad.get(param, None)
-                    if value is None:
-                        try:
-                            value = ad.eval(param)
-                        except:
-                            value = None
-                    job_dict[param] = value if value is not None else ""
-                except:
-                    job_dict[param] = ""
-            
-            jobs_data.append(job_dict)
-            job_count += 1
-            
-            # Progress indicator
-            if job_count % 1000 == 0:
-                print(f"  Fetched {job_count} jobs from history...", file=sys.stderr)
-        
-        print(f"  History complete: {job_count} jobs", file=sys.stderr)
+        csvfile = tempfile.NamedTemporaryFile(
+            'w', dir=output_dir, prefix=f".cluster_{cluster_id}_", suffix=".csv.tmp",
+            delete=False, newline='', encoding='utf-8'
+        )
     except Exception as e:
-        print(f"Warning: Error querying history: {e}", file=sys.stderr)
+        print(f"Error writing CSV: {e}", file=sys.stderr)
+        sys.exit(1)
     
-    # Query current queue for running/pending/held jobs
-    print("Querying current queue...", file=sys.stderr)
-    queue_count = 0
     try:
-        for ad in schedd.query(
-            constraint=f"ClusterId == {cluster_id}",
-            projection=REQUIRED_PARAMS,
-            limit=-1
-        ):
-            job_dict = {}
-            for param in REQUIRED_PARAMS:
-                try:
-                    value = ad.get(param, None)
-                    if value is None:
-                        try:
-                            value = ad.eval(param)
-                        except:
-                            value = None
-                    job_dict[param] = value if value is not None else ""
-                except:
-                    job_dict[param] = ""
+        with csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(REQUIRED_PARAMS)
+        
+            # Query history for completed jobs
+            print("Querying job history...", file=sys.stderr)
+            try:
+                for i, ad in enumerate(schedd.history(
+                    constraint=f"ClusterId == {cluster_id}",
+                    projection=REQUIRED_PARAMS,
+                    match=-1
+                )):
+                    row = job_row(ad, missing_params)
+                    writer.writerow(row)
+                    raw_status_counts[row[status_index]] += 1
+                    job_count += 1
+                
+                    # Progress indicator
+                    if job_count % 1000 == 0:
+                        print(f"  Fetched {job_count} jobs from history...", file=sys.stderr)
             
-            jobs_data.append(job_dict)
-            job_count += 1
-            queue_count += 1
+                print(f"  History complete: {job_count} jobs", file=sys.stderr)
+            except Exception as e:
+                print(f"Warning: Error querying history: {e}", file=sys.stderr)
         
-        print(f"  Queue complete: {queue_count} jobs", file=sys.stderr)
-    except Exception as e:
-        print(f"Warning: Error querying queue: {e}", file=sys.stderr)
+            # Query current queue for running/pending/held jobs
+            print("Querying current queue...", file=sys.stderr)
+            queue_count = 0
+            try:
+                for ad in schedd.query(
+                    constraint=f"ClusterId == {cluster_id}",
+                    projection=REQUIRED_PARAMS,
+                    limit=-1
+                ):
+                    row = job_row(ad, missing_params)
+                    writer.writerow(row)
+                    raw_status_counts[row[status_index]] += 1
+                    job_count += 1
+                    queue_count += 1
+            
+                print(f"  Queue complete: {queue_count} jobs", file=sys.stderr)
+            except Exception as e:
+                print(f"Warning: Error querying queue: {e}", file=sys.stderr)
+    except BaseException:
+        os.remove(csvfile.name)
+        raise
     
     # Check if any jobs were found
     if job_count == 0:
+        os.remove(csvfile.name)
         print(f"\nError: No jobs found for cluster {cluster_id}")
         print("Please verify the cluster ID is correct.")
         sys.exit(1)
     
-    # Write to CSV
-    print(f"\nWriting {job_count} jobs to CSV...", file=sys.stderr)
-    try:
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=REQUIRED_PARAMS)
-            writer.writeheader()
-            writer.writerows(jobs_data)
-        
-        print(f"✓ Successfully saved data to: {filepath}")
-        print(f"✓ Total jobs fetched: {job_count}")
-        
-        # Print job status breakdown
-        status_counts = {}
-        status_names = {
-            1: "Idle",
-            2: "Running", 
-            3: "Removing",
-            4: "Completed",
-            5: "Held",
-            6: "Transferring",
-            7: "Suspended"
-        }
-        
-        for job in jobs_data:
-            status = job.get("JobStatus", "")
-            if status:
-                try:
-                    status_int = int(status)
-                    status_name = status_names.get(status_int, f"Unknown({status_int})")
-                    status_counts[status_name] = status_counts.get(status_name, 0) + 1
-                except:
-                    pass
-        
-        if status_counts:
-            print("\nJob Status Breakdown:")
-            for status, count in sorted(status_counts.items()):
-                print(f"  {status:<15}: {count:>6} jobs")
-        
-        return filepath, job_count
-        
-    except Exception as e:
-        print(f"Error writing CSV: {e}", file=sys.stderr)
-        sys.exit(1)
+    # NamedTemporaryFile creates the file private to its owner; give it the usual permissions
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(csvfile.name, 0o666 & ~umask)
+    os.replace(csvfile.name, filepath)
+    
+    if missing_params:
+        absent = ", ".join(sorted(missing_params))
+        print(f"Warning: Some jobs are missing {absent}; written as blank", file=sys.stderr)
+    
+    print(f"✓ Successfully saved data to: {filepath}")
+    print(f"✓ Total jobs fetched: {job_count}")
+    
+    # Print job status breakdown
+    status_counts = {}
+    status_names = {
+        1: "Idle",
+        2: "Running", 
+        3: "Removing",
+        4: "Completed",
+        5: "Held",
+        6: "Transferring",
+        7: "Suspended"
+    }
+    
+    for status, count in raw_status_counts.items():
+        if status:
+            try:
+                status_int = int(status)
+                status_name = status_names.get(status_int, f"Unknown({status_int})")
+                status_counts[status_name] = status_counts.get(status_name, 0) + count
+            except:
+                pass
+    
+    if status_counts:
+        print("\nJob Status Breakdown:")
+        for status, count in sorted(status_counts.items()):
+            print(f"  {status:<15}: {count:>6} jobs")
+    
+    return filepath, job_count
 
 
 def validate_cluster_exists(cluster_id):
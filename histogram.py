@@ -1,9 +1,27 @@
 import sys
 import os
+import io
 import csv
+import itertools
 import numpy as np
 from datetime import datetime, timedelta
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 """
 This program takes data from the cluster_data folder and gives an ASCII histogram
 of the runtimes for a cluster. The runtimes are grouped by percentile range of the runtimes
@@ -11,21 +29,32 @@ of the runtimes for a cluster. The runtimes are grouped by percentile range of t
 """
 
 
+# job attributes read from the cluster CSV
+HIST_COLUMNS = ["ClusterId", "ProcId", "RemoteWallClockTime", "QDate", "CompletionDate"]
+NUMERIC_COLUMNS = {
+    "runtimes": "RemoteWallClockTime",
+    "submit_times": "QDate",
+    "completion_times": "CompletionDate",
+}
+
 
 # function to format seconds into human readable format
 def format_seconds_human(seconds):
-    seconds = int(seconds)
-    if seconds == 0:
-        return "0s"
-    parts = []
-    days, seconds = divmod(seconds, 86400)
-    hours, seconds = divmod(seconds, 3600)
-    minutes, seconds = divmod(seconds, 60)
-    if days: parts.append(f"{days}d")
-    if hours: parts.append(f"{hours}h")
-    if minutes: parts.append(f"{minutes}m")
-    if seconds: parts.append(f"{seconds}s")
-    return ' '.join(parts)
+    return format_seconds_human_vec([seconds])[0]
+
+
+# vectorized format_seconds_human: the day/hour/minute/second split is done
+# with array divmod for all values at once
+def format_seconds_human_vec(values):
+    seconds = np.asarray(values).astype(np.int64)
+    days, seconds = np.divmod(seconds, 86400)
+    hours, seconds = np.divmod(seconds, 3600)
+    minutes, seconds = np.divmod(seconds, 60)
+    labels = []
+    for d, h, m, s in zip(days.tolist(), hours.tolist(), minutes.tolist(), seconds.tolist()):
+        parts = [f"{v}{unit}" for v, unit in ((d, "d"), (h, "h"), (m, "m"), (s, "s")) if v]
+        labels.append(' '.join(parts) or "0s")
+    return labels
 
 
 # function to format seconds into human relative format
@@ -55,47 +84,99 @@ def format_epoch_human_relative(epoch_seconds):
         return "N/A"
 
 
-def safe_float(value):
-    """Safely convert a value to float, returning None if conversion fails"""
-    if value is None or value == '':
-        return None
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
-
-
-def scatter_plot_job_index_vs_runtime(cluster_id, jobs, height=12, width=60):
+# linear-interpolation percentiles of an already sorted array, computed the
+# same way as np.percentile so the results match it exactly
+def _percentiles_sorted(sorted_values, percentiles):
+    virtual = np.asarray(percentiles, dtype=np.float64) / 100 * (sorted_values.size - 1)
+    lo = np.floor(virtual).astype(np.intp)
+    hi = np.minimum(lo + 1, sorted_values.size - 1)
+    return _lerp(sorted_values[lo], sorted_values[hi], virtual - lo)
+
+
+# sorts the runtimes once and reads off what the reports need from the
+# sorted array: the 95th percentile and the number of jobs under 10 minutes
+def _sorted_stats(runtimes):
+    sorted_runtimes = np.sort(runtimes)
+    p95 = _percentiles_sorted(sorted_runtimes, 95)
+    fast_jobs = np.searchsorted(sorted_runtimes, 600, side="left")
+    return sorted_runtimes, p95, fast_jobs
+
+
+# np.percentile's interpolation between neighbouring order statistics: it
+# works from the nearer neighbour, which keeps the results bit-identical
+def _lerp(below, above, t):
+    diff = above - below
+    return np.where(t >= 0.5, above - diff * (1 - t), below + diff * t)[()]
+
+
+# median runtime of each bin (0 for an empty bin) read from the middle of its
+# slice of the sorted runtimes, and whether that median is under 10 minutes
+def _bin_stats_loop(sorted_runtimes, cuts):
+    n = cuts.size - 1
+    medians = np.zeros(n)
+    is_red = np.empty(n, np.bool_)
+    for i in range(n):
+        start, stop = cuts[i], cuts[i + 1]
+        if stop > start:
+            medians[i] = (sorted_runtimes[(start + stop - 1) // 2] + sorted_runtimes[(start + stop) // 2]) / 2
+        is_red[i] = medians[i] < 600
+    return medians, is_red
+
+# same computation as _bin_stats_loop with whole-array NumPy operations
+def _bin_stats_numpy(sorted_runtimes, cuts):
+    starts, stops = cuts[:-1], cuts[1:]
+    last = sorted_runtimes.size - 1
+    lower_mid = sorted_runtimes[np.clip((starts + stops - 1) // 2, 0, last)]
+    upper_mid = sorted_runtimes[np.clip((starts + stops) // 2, 0, last)]
+    medians = np.where(stops > starts, (lower_mid + upper_mid) / 2, 0.0)
+    return medians, medians < 600
+
+# compiled once and cached on disk when numba is installed
+_bin_stats = njit(cache=True)(_bin_stats_loop) if njit is not None else _bin_stats_numpy
+
+
+# Pearson correlation of two 1-D arrays from centered dot products, without
+# the 2x2 covariance matrix np.corrcoef builds; 0.0 when either is constant
+def _pearson(x, y):
+    xc = x - x.mean()
+    yc = y - y.mean()
+    denom = np.sqrt((xc @ xc) * (yc @ yc))
+    return (xc @ yc) / denom if denom > 0 else 0.0
+
+
+# Pearson correlation of y against its index 0..n-1; the index's mean and
+# spread have closed forms, and since yc sums to zero xc @ yc is arange @ yc
+def _fast_pearson_vs_arange(y):
+    n = y.size
+    yc = y - y.mean()
+    sxx = n * (n * n - 1) / 12
+    denom = np.sqrt(sxx * (yc @ yc))
+    return (np.arange(n) @ yc) / denom if denom > 0 else 0.0
+
+
+def scatter_plot_job_index_vs_runtime(cluster_id, arrays, height=12, width=60):
     """
     Scatter plot: Job Index vs Runtime
     Shows runtime trends across job sequence (useful for detecting patterns)
     """
     
-    job_indices = []
-    runtimes = []
+    job_indices = arrays["job_indices"]
+    runtimes = arrays["runtimes"]
     
-    for idx, job in enumerate(jobs):
-        runtime = safe_float(job.get("RemoteWallClockTime"))
-        
-        if runtime is not None:
-            job_indices.append(idx)
-            runtimes.append(runtime)
-    
-    if not runtimes:
+    if runtimes.size == 0:
         print("[WARN] No valid runtime data for scatter plot.")
         return
     
-    job_indices = np.array(job_indices)
-    runtimes = np.array(runtimes)
+    max_index = arrays["total_jobs"] - 1
     
-    max_index = len(jobs) - 1
+    sorted_runtimes = arrays["sorted_runtimes"]
     
     # Use 95th percentile as max instead of absolute max to handle outliers better
-    p95_runtime = np.percentile(runtimes, 95)
+    p95_runtime = arrays["p95_runtime"]
     max_runtime = p95_runtime
     
     # Count outliers above 95th percentile
-    outliers = np.sum(runtimes > p95_runtime)
+    outliers = sorted_runtimes.size - np.searchsorted(sorted_runtimes, p95_runtime, side="right")
     
     # Normalize to plot dimensions
     x_positions = (job_indices / max_index * (width - 1)).astype(int) if max_index > 0 else np.zeros(len(job_indices), dtype=int)
@@ -104,151 +185,126 @@ def scatter_plot_job_index_vs_runtime(cluster_id, jobs, height=12, width=60):
     capped_runtimes = np.minimum(runtimes, max_runtime)
     y_positions = ((max_runtime - capped_runtimes) / max_runtime * (height - 1)).astype(int)
     
-    # Create plot grid - use different symbols for density
-    plot = [[' ' for _ in range(width)] for _ in range(height)]
-    density = [[0 for _ in range(width)] for _ in range(height)]
-    
-    # Count points at each position
-    for x, y in zip(x_positions, y_positions):
-        if 0 <= y < height and 0 <= x < width:
-            density[y][x] += 1
-    
-    # Place symbols based on density
-    for y in range(height):
-        for x in range(width):
-            if density[y][x] > 0:
-                if density[y][x] == 1:
-                    plot[y][x] = '·'
-                elif density[y][x] <= 3:
-                    plot[y][x] = '•'
-                else:
-                    plot[y][x] = '█'
+    # Count points at each position in one pass over the linearized grid
+    on_grid = (y_positions >= 0) & (y_positions < height) & (x_positions >= 0) & (x_positions < width)
+    cells = y_positions[on_grid] * width + x_positions[on_grid]
+    density = np.bincount(cells, minlength=height * width).reshape(height, width)
+    
+    # Place symbols based on density: 1 job, 2-3 jobs, 4+ jobs
+    symbols = np.array([' ', '·', '•', '•', '█'])[np.minimum(density, 4)]
+    plot = [''.join(row) for row in symbols]
     
     # Calculate correlation to detect trends
-    correlation = np.corrcoef(job_indices, runtimes)[0, 1]
+    correlation = _pearson(job_indices, runtimes)
     
-    # Calculate median runtime for first/last thirds
-    third = len(runtimes) // 3
-    if third > 0:
-        first_third_median = np.median(runtimes[:third])
-        last_third_median = np.median(runtimes[-third:])
-    else:
-        first_third_median = last_third_median = np.median(runtimes)
+    median_runtime = (sorted_runtimes[(runtimes.size - 1) // 2] + sorted_runtimes[runtimes.size // 2]) / 2
     
-    median_runtime = np.median(runtimes)
+    # The plot is assembled in memory and written with one call
+    buf = io.StringIO()
     
-    print(f"\n{'Job Index vs Runtime Scatter Plot':^70}")
-    print("=" * 70)
-    print(f"Jobs: {len(runtimes)}  |  Median: {format_seconds_human(median_runtime)}  |  Correlation: {correlation:.3f}")
+    print(f"\n{'Job Index vs Runtime Scatter Plot':^70}", file=buf)
+    print("=" * 70, file=buf)
+    print(f"Jobs: {len(runtimes)}  |  Median: {format_seconds_human(median_runtime)}  |  Correlation: {correlation:.3f}", file=buf)
     
     if correlation > 0.4:
-        print("Trend: Later jobs run LONGER ⚠️")
+        print("Trend: Later jobs run LONGER ⚠️", file=buf)
     elif correlation < -0.4:
-        print("Trend: Later jobs run FASTER ✓")
+        print("Trend: Later jobs run FASTER ✓", file=buf)
     else:
-        print("Trend: Consistent runtime across jobs ✓")
-    print()
+        print("Trend: Consistent runtime across jobs ✓", file=buf)
+    print(file=buf)
+    
+    # Y-axis labels for the top and middle rows
+    top_label, mid_label = format_seconds_human_vec(
+        max_runtime - np.array([0, height // 2]) / (height - 1) * max_runtime
+    )
     
     # Print Y-axis (Runtime) and plot
     for i in range(height):
-        runtime_val = max_runtime - (i / (height - 1)) * max_runtime
-        
         if i == 0:
-            label = format_seconds_human(runtime_val)
-            print(f"{label:>9} |", end="")
+            print(f"{top_label:>9} |", end="", file=buf)
         elif i == height - 1:
-            print(f"{'0s':>9} |", end="")
+            print(f"{'0s':>9} |", end="", file=buf)
         elif i == height // 2:
-            label = format_seconds_human(runtime_val)
-            print(f"{label:>9} |", end="")
+            print(f"{mid_label:>9} |", end="", file=buf)
         else:
-            print(f"{'':<10} |", end="")
+            print(f"{'':<10} |", end="", file=buf)
         
-        print(''.join(plot[i]))
+        print(plot[i], file=buf)
     
     # Print X-axis (Job Index)
-    print(f"{'':<10} +{'-' * width}")
-    print(f"{'':<12}0{' ' * (width//2 - 5)}{max_index // 2}{' ' * (width//2 - 5)}{max_index}")
-    print(f"{'':<12}Job Index")
+    print(f"{'':<10} +{'-' * width}", file=buf)
+    print(f"{'':<12}0{' ' * (width//2 - 5)}{max_index // 2}{' ' * (width//2 - 5)}{max_index}", file=buf)
+    print(f"{'':<12}Job Index", file=buf)
     
     # Print legend and info
-    print(f"\nSymbols: · = 1 job   • = 2-3 jobs   █ = 4+ jobs")
+    print(f"\nSymbols: · = 1 job   • = 2-3 jobs   █ = 4+ jobs", file=buf)
     if outliers > 0:
-        print(f"Note: {outliers} job(s) with runtime > {format_seconds_human(p95_runtime)} (95th percentile) not shown")
-    print()
+        print(f"Note: {outliers} job(s) with runtime > {format_seconds_human(p95_runtime)} (95th percentile) not shown", file=buf)
+    print(file=buf)
+    
+    sys.stdout.write(buf.getvalue())
 
 
-def histogram(cluster_id, jobs, percentiles=10, max_width=20, show_fast_jobs=False):
+def histogram(cluster_id, arrays, percentiles=10, max_width=20, show_fast_jobs=False):
 
     # Check if jobs list is empty
-    if not jobs:
+    if arrays["total_jobs"] == 0:
         print("[WARN] No valid data to plot.")
         return
     
-    # Extract job runtime data and identifiers
-    runtimes = []
-    cluster_ids = []
-    proc_ids = []
-    submit_times = []
-    completion_times = []
-    
-    for job in jobs:
-        runtime = safe_float(job.get("RemoteWallClockTime"))
-        if runtime is not None:
-            runtimes.append(runtime)
-            cluster_ids.append(job.get("ClusterId", ""))
-            proc_ids.append(job.get("ProcId", ""))
-            
-            qdate = safe_float(job.get("QDate"))
-            if qdate is not None:
-                submit_times.append(qdate)
-            
-            comp_date = safe_float(job.get("CompletionDate"))
-            if comp_date is not None:
-                completion_times.append(comp_date)
-    
-    if not runtimes:
+    runtimes = arrays["runtimes"]
+    submit_times = arrays["submit_times"]
+    completion_times = arrays["completion_times"]
+    
+    if runtimes.size == 0:
         print("[WARN] No valid runtime data to plot.")
         return
-    
-    # Convert to numpy arrays for faster computation
-    runtimes = np.array(runtimes)
-    cluster_ids = np.array(cluster_ids)
-    proc_ids = np.array(proc_ids)
 
     # Create evenly-spaced percentile boundaries (e.g., 0%, 10%, 20%, ..., 100%)
     # percentiles=10 creates 11 boundaries defining 10 bins
     percentiles_list = np.linspace(0, 100, percentiles + 1)
     
+    # The percentile boundaries and every bin are read from the sorted runtimes
+    sorted_runtimes = arrays["sorted_runtimes"]
+    
     # Calculate the actual runtime values at each percentile boundary
-    bin_edges = np.percentile(runtimes, percentiles_list)
+    bin_edges = _percentiles_sorted(sorted_runtimes, percentiles_list)
+    
+    # Position of each boundary in the sorted runtimes: bins are [left, right)
+    # except the last, which also takes the jobs equal to the maximum
+    cuts = np.searchsorted(sorted_runtimes, bin_edges, side="left")
+    cuts[-1] = sorted_runtimes.size
     
     # Count how many jobs fall into each percentile bin
-    counts, _ = np.histogram(runtimes, bins=bin_edges)
+    counts = np.diff(cuts)
     
     # Find the bin with the most jobs (used to scale the bar chart)
     max_count = counts.max()
 
-    print(f"\n{'Histogram of Job Runtimes by Percentiles':^80}")
-    print("=" * 80)
-    print(f"ClusterId: {cluster_id}\n")
+    # The report is assembled in memory and written with one call
+    buf = io.StringIO()
+
+    print(f"\n{'Histogram of Job Runtimes by Percentiles':^80}", file=buf)
+    print("=" * 80, file=buf)
+    print(f"ClusterId: {cluster_id}\n", file=buf)
 
     # Display cluster submission and completion time range
-    if submit_times:
+    if submit_times.size:
         # Find when the first job in the cluster was submitted
-        cluster_submit_time = format_epoch_human_relative(min(submit_times))
-        print(f"First Submitted : {cluster_submit_time}")
+        cluster_submit_time = format_epoch_human_relative(submit_times.min())
+        print(f"First Submitted : {cluster_submit_time}", file=buf)
     else:
-        print("First Submitted : N/A")
+        print("First Submitted : N/A", file=buf)
 
-    if completion_times:
+    if completion_times.size:
         # Find when the last job in the cluster completed
-        cluster_completion_time = format_epoch_human_relative(max(completion_times))
-        print(f"Last Completed  : {cluster_completion_time}")
+        cluster_completion_time = format_epoch_human_relative(completion_times.max())
+        print(f"Last Completed  : {cluster_completion_time}", file=buf)
     else:
-        print("Last Completed  : N/A")
+        print("Last Completed  : N/A", file=buf)
 
-    print("") 
+    print("", file=buf)
 
     # Column widths for formatted output
     pct_width = 11      # Width for percentile range 
@@ -266,45 +322,48 @@ def histogram(cluster_id, jobs, percentiles=10, max_width=20, show_fast_jobs=Fal
         f"| {'Histogram':<{max_width}}"
         f" {'# Jobs':>{count_width}}"
     )
-    print(header)
-    print("-" * len(header))
+    print(header, file=buf)
+    print("-" * len(header), file=buf)
 
     # Track jobs that complete very quickly (potential efficiency issues)
     jobs_under_10_min_median = 0   # Count of jobs in bins with median < 10 minutes
-    fast_job_ids = []              # List of specific job IDs
+    fast_job_rows = []             # Indices of those jobs, one array per bin
+    if show_fast_jobs:
+        # A stable argsort lines up with the sorted runtimes, so each bin's
+        # slice of it holds the positions of that bin's jobs
+        order = np.argsort(runtimes, kind="stable")
+
+    # Time range labels for every bin boundary (e.g., "5m 12s")
+    edge_labels = format_seconds_human_vec(bin_edges)
+
+    # Calculate median runtime for jobs in each bin (empty bins count as 0)
+    # Median is more robust than mean for skewed distributions
+    # Flag bins where median runtime < 10 minutes (600 seconds)
+    # These may indicate jobs that are too short to efficiently use cluster resources
+    medians, is_red_bins = _bin_stats(sorted_runtimes, cuts)
+
+    # Create bar chart: scale bar length proportionally to job count
+    # Bar length = (jobs in bin / max jobs in any bin) * max_width
+    bar_lens = (counts / max_count * max_width).astype(np.int64)
+    full_bar = "█" * max_width
 
     # Iterate through each percentile bin
     for i in range(len(counts)):
-        # Get the runtime boundaries for this bin
-        left = bin_edges[i]      
-        right = bin_edges[i + 1]  
-        
-        # Last bin includes right edge (<=), others exclude it (<)
-        in_bin_mask = (runtimes >= left) & (runtimes <= right) if i == len(counts) - 1 else (runtimes >= left) & (runtimes < right)
-        
-        # Extract data for jobs in this bin
-        in_bin_times = runtimes[in_bin_mask]
-        in_bin_clusters = cluster_ids[in_bin_mask]
-        in_bin_procs = proc_ids[in_bin_mask]
-
-        # Calculate median runtime for jobs in this bin
-        # Median is more robust than mean for skewed distributions
-        median_time = np.median(in_bin_times) if len(in_bin_times) > 0 else 0
-
-        # Flag bins where median runtime < 10 minutes (600 seconds)
-        # These may indicate jobs that are too short to efficiently use cluster resources
-        is_red = median_time < 600
+        start, stop = cuts[i], cuts[i + 1]
+        is_red = is_red_bins[i]
 
         # Apply red color highlighting to fast job bins
         color = RED if is_red else ""
         if is_red:
             # Track fast jobs for reporting
-            jobs_under_10_min_median += len(in_bin_times)
-            fast_job_ids.extend([f"{cid}.{pid}" for cid, pid in zip(in_bin_clusters, in_bin_procs)])
+            jobs_under_10_min_median += counts[i]
+            if show_fast_jobs and stop > start:
+                # Jobs are listed in their original order within the bin
+                fast_job_rows.append(np.sort(order[start:stop]))
 
         # Format time range labels (e.g., "5.2 min - 12.3 min")
-        left_label = format_seconds_human(left)
-        right_label = format_seconds_human(right)
+        left_label = edge_labels[i]
+        right_label = edge_labels[i + 1]
         time_range = f"{left_label:>10} - {right_label:>10}".rjust(label_width)
 
         # Format percentile range (e.g., "00–10%")
@@ -312,38 +371,176 @@ def histogram(cluster_id, jobs, percentiles=10, max_width=20, show_fast_jobs=Fal
         pct_end = int(percentiles_list[i + 1])
         pct_range = f"{pct_start:02}–{pct_end:02}%".ljust(pct_width)
 
-        # Create bar chart: scale bar length proportionally to job count
-        # Bar length = (jobs in bin / max jobs in any bin) * max_width
-        bar = "█" * int((counts[i] / max_count) * max_width)
+        bar = full_bar[:bar_lens[i]]
         colored_bar = f"{color}{bar:<{max_width}}{RESET}"
 
         # Print the row for this bin
-        print(f"{pct_range}{time_range} | {colored_bar} {counts[i]:>{count_width}}")
+        print(f"{pct_range}{time_range} | {colored_bar} {counts[i]:>{count_width}}", file=buf)
 
     # Summary information about potentially inefficient jobs
-    print(f"\n{RED}Note:{RESET} Bars in red represent bins with median runtime < 10 minutes.")
-    print(f"{RED}Info:{RESET} Total number of jobs in such bins: {jobs_under_10_min_median}")
+    print(f"\n{RED}Note:{RESET} Bars in red represent bins with median runtime < 10 minutes.", file=buf)
+    print(f"{RED}Info:{RESET} Total number of jobs in such bins: {jobs_under_10_min_median}", file=buf)
 
     # Optionally show specific job IDs for investigation
-    if show_fast_jobs and fast_job_ids:
-        print(f"\nList of Job IDs with median runtime < 10 minutes:")
-        print(", ".join(fast_job_ids))
+    if show_fast_jobs and fast_job_rows:
+        # map positions among the timed jobs back to CSV rows for the ids
+        rows = arrays["job_indices"][np.concatenate(fast_job_rows)]
+        fast_job_ids = np.char.add(np.char.add(arrays["cluster_ids"][rows], "."), arrays["proc_ids"][rows])
+        print(f"\nList of Job IDs with median runtime < 10 minutes:", file=buf)
+        print(", ".join(fast_job_ids.tolist()), file=buf)
 
+    sys.stdout.write(buf.getvalue())
 
-# function to load data from CSV file
-def load_data_for_cluster(cluster_id):
+
+# path of the CSV written by fetch_cluster_data.py for a cluster
+def _job_csv_path(cluster_id):
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(script_dir, "cluster_data")
-    filepath = os.path.join(data_dir, f"cluster_{cluster_id}_jobs.csv")
+    return os.path.join(data_dir, f"cluster_{cluster_id}_jobs.csv")
+
+
+# reads HIST_COLUMNS as arrays: ids stay strings, the numeric columns are
+# float64 with NaN where the value is blank or invalid; the id columns are
+# only read when include_ids is set, since only the fast job list uses them
+def _read_job_arrays(filepath, include_ids=True):
+    if pa is not None:
+        try:
+            return _read_job_arrays_arrow(filepath, include_ids)
+        except pa.ArrowInvalid:
+            # a cell arrow cannot parse as a number (e.g. an unevaluated
+            # expression); the readers below coerce those to NaN instead
+            pass
+
+    if pd is None:
+        return _read_job_arrays_csv(filepath, include_ids)
+
+    columns = HIST_COLUMNS if include_ids else list(NUMERIC_COLUMNS.values())
+    df = pd.read_csv(
+        filepath,
+        usecols=lambda c: c in columns,
+        dtype=str,
+        keep_default_na=False,
+        engine="c",
+    )
+    # columns absent from older CSVs are read as blanks
+    df = df.reindex(columns=columns, fill_value="")
+
+    def numeric(name):
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+
+    arrays = {key: numeric(name) for key, name in NUMERIC_COLUMNS.items()}
+    if include_ids:
+        arrays["cluster_ids"] = df["ClusterId"].to_numpy(dtype=str)
+        arrays["proc_ids"] = df["ProcId"].to_numpy(dtype=str)
+    return arrays
+
+
+# pyarrow reader: multithreaded parsing straight into columnar buffers
+def _read_job_arrays_arrow(filepath, include_ids=True):
+    column_types = {name: pa.float64() for name in NUMERIC_COLUMNS.values()}
+    if include_ids:
+        column_types.update(ClusterId=pa.string(), ProcId=pa.string())
+    table = pacsv.read_csv(
+        filepath,
+        # HoldReason and Args can contain quoted newlines
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types=column_types,
+            include_columns=list(column_types),
+            include_missing_columns=True,
+            null_values=["", "undefined", "UNDEFINED"],
+        ),
+    )
+
+    def numeric(name):
+        return table[name].cast(pa.float64()).to_numpy(zero_copy_only=False)
+
+    def ids(name):
+        # only a column missing from the file is null; it reads as blanks
+        return table[name].cast(pa.string()).fill_null("").to_numpy(zero_copy_only=False).astype(str)
+
+    arrays = {key: numeric(name) for key, name in NUMERIC_COLUMNS.items()}
+    if include_ids:
+        arrays["cluster_ids"] = ids("ClusterId")
+        arrays["proc_ids"] = ids("ProcId")
+    return arrays
+
+
+# fallback for _read_job_arrays when neither pyarrow nor pandas is installed:
+# csv.reader with column positions looked up once, so no dict is built per row
+def _read_job_arrays_csv(filepath, include_ids=True):
+    cluster_ids, proc_ids = [], []
+
+    with open(filepath, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        index = {name: i for i, name in enumerate(header)}
+        numeric_positions = [index.get(name) for name in NUMERIC_COLUMNS.values()]
+        cluster_pos, proc_pos = index.get("ClusterId"), index.get("ProcId")
+
+        def cell(row, i):
+            return row[i] if i is not None and i < len(row) else ""
+
+        # rows are streamed into genfromtxt rather than collected first; a
+        # cell holding a comma (an unevaluated expression) is never a number
+        def numeric_lines(rows):
+            for row in rows:
+                if include_ids:
+                    cluster_ids.append(cell(row, cluster_pos))
+                    proc_ids.append(cell(row, proc_pos))
+                yield ",".join(
+                    "" if "," in value else value
+                    for value in (cell(row, i) for i in numeric_positions)
+                )
+
+        # blank and non-numeric cells come back as NaN
+        first = next(reader, None)
+        if first is None:
+            table = np.empty((0, len(NUMERIC_COLUMNS)))
+        else:
+            table = np.genfromtxt(
+                numeric_lines(itertools.chain([first], reader)),
+                delimiter=",", dtype=np.float64, ndmin=2,
+            )
+
+    arrays = {key: np.ascontiguousarray(table[:, j]) for j, key in enumerate(NUMERIC_COLUMNS)}
+    if include_ids:
+        arrays["cluster_ids"] = np.array(cluster_ids, dtype=str)
+        arrays["proc_ids"] = np.array(proc_ids, dtype=str)
+    return arrays
+
+
+# keeps the jobs that have a runtime, once, for both plots: their row
+# indices and runtimes, plus the submit/completion times they carry; ids are
+# left unfiltered and only looked up through job_indices when listed
+def _extract_arrays(jobs):
+    valid = ~np.isnan(jobs["runtimes"])
+    runtimes = jobs["runtimes"][valid]
+    sorted_runtimes, p95, _ = _sorted_stats(runtimes) if runtimes.size else (runtimes, None, 0)
+    submit_times = jobs["submit_times"][valid]
+    completion_times = jobs["completion_times"][valid]
+    return {
+        "total_jobs": len(valid),
+        "job_indices": np.flatnonzero(valid),
+        "runtimes": runtimes,
+        "sorted_runtimes": sorted_runtimes,
+        "p95_runtime": p95,
+        "cluster_ids": jobs.get("cluster_ids"),
+        "proc_ids": jobs.get("proc_ids"),
+        "submit_times": submit_times[~np.isnan(submit_times)],
+        "completion_times": completion_times[~np.isnan(completion_times)],
+    }
+
+
+# function to load data from CSV file
+def load_data_for_cluster(cluster_id, include_ids=True):
+    filepath = _job_csv_path(cluster_id)
 
     if not os.path.exists(filepath):
         print(f"Cluster Data not found, please make sure you have the correct .csv, filepath and the correct cluster id")
         sys.exit(1)
 
-    with open(filepath, newline='', encoding='utf-8') as f:
-        jobs = list(csv.DictReader(f))
-    
-    return jobs
+    return _read_job_arrays(filepath, include_ids)
 
 
 def get_histogram_data(cluster_id):
@@ -355,59 +552,47 @@ def get_histogram_data(cluster_id):
         dict: Dictionary containing runtime analysis metrics
     """
     # Load data without exiting on error (for use by cluster_health.py)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, "cluster_data")
-    filepath = os.path.join(data_dir, f"cluster_{cluster_id}_jobs.csv")
+    filepath = _job_csv_path(cluster_id)
 
     if not os.path.exists(filepath):
         return None
 
-    with open(filepath, newline='', encoding='utf-8') as f:
-        jobs = list(csv.DictReader(f))
+    jobs = _read_job_arrays(filepath, include_ids=False)
     
-    if not jobs:
+    if len(jobs["runtimes"]) == 0:
         return None
     
-    runtimes = []
-    submit_times = []
-    completion_times = []
-    
-    for job in jobs:
-        runtime = safe_float(job.get("RemoteWallClockTime"))
-        if runtime is not None and runtime > 0:
-            runtimes.append(runtime)
-        
-        qdate = safe_float(job.get("QDate"))
-        if qdate is not None:
-            submit_times.append(qdate)
-        
-        comp_date = safe_float(job.get("CompletionDate"))
-        if comp_date is not None:
-            completion_times.append(comp_date)
+    runtimes = jobs["runtimes"]
+    runtimes = runtimes[runtimes > 0]
+    submit_times = jobs["submit_times"]
+    submit_times = submit_times[~np.isnan(submit_times)]
+    completion_times = jobs["completion_times"]
+    completion_times = completion_times[~np.isnan(completion_times)]
     
-    if not runtimes:
+    if runtimes.size == 0:
         return None
     
-    runtimes = np.array(runtimes)
+    # One sort gives the median, extremes, p95 and both threshold counts
+    sorted_runtimes, p95, fast_jobs = _sorted_stats(runtimes)
+    n = sorted_runtimes.size
+    median_runtime = (sorted_runtimes[(n - 1) // 2] + sorted_runtimes[n // 2]) / 2
     
-    mean_runtime = np.mean(runtimes)
-    median_runtime = np.median(runtimes)
-    std_runtime = np.std(runtimes)
+    # Mean and population std in one reduction sweep each
+    mean_runtime = runtimes.mean()
+    deviations = runtimes - mean_runtime
+    std_runtime = np.sqrt((deviations * deviations).sum() / n)
     
     # Coefficient of variation
     cv = (std_runtime / mean_runtime) if mean_runtime > 0 else 0
     
     # Count fast jobs (< 10 minutes)
-    fast_jobs = np.sum(runtimes < 600)
-    fast_jobs_pct = (fast_jobs / len(runtimes)) * 100
+    fast_jobs_pct = (fast_jobs / n) * 100
     
     # Count very long jobs (> 95th percentile)
-    p95 = np.percentile(runtimes, 95)
-    long_jobs = np.sum(runtimes > p95)
+    long_jobs = n - np.searchsorted(sorted_runtimes, p95, side="right")
     
-    # Calculate correlation (job index vs runtime)
-    job_indices = np.arange(len(runtimes))
-    correlation = np.corrcoef(job_indices, runtimes)[0, 1]
+    # Calculate correlation (job index vs runtime); undefined for one job
+    correlation = _fast_pearson_vs_arange(runtimes) if n >= 2 else 0.0
     
     return {
         "total_runtime_jobs": len(runtimes),
@@ -419,11 +604,11 @@ def get_histogram_data(cluster_id):
         "fast_jobs_pct": fast_jobs_pct,
         "long_jobs": long_jobs,
         "p95_runtime": p95,
-        "min_runtime": np.min(runtimes),
-        "max_runtime": np.max(runtimes),
+        "min_runtime": sorted_runtimes[0],
+        "max_runtime": sorted_runtimes[-1],
         "correlation": correlation,
-        "first_submitted": min(submit_times) if submit_times else None,
-        "last_completed": max(completion_times) if completion_times else None,
+        "first_submitted": submit_times.min() if submit_times.size else None,
+        "last_completed": completion_times.max() if completion_times.size else None,
     }
 
 
@@ -435,10 +620,12 @@ if __name__ == "__main__":
     cluster_id = sys.argv[1]
     print_list_flag = sys.argv[2].lower() in ("true", "yes", "1") if len(sys.argv) > 2 else False
 
-    jobs = load_data_for_cluster(cluster_id)
+    # ids are only needed for the list of fast job ids
+    jobs = load_data_for_cluster(cluster_id, include_ids=print_list_flag)
+    arrays = _extract_arrays(jobs)
     
     # Display scatter plot (smaller and more compact)
-    scatter_plot_job_index_vs_runtime(cluster_id, jobs, height=15, width=60)
+    scatter_plot_job_index_vs_runtime(cluster_id, arrays, height=15, width=60)
     
     # Then display histogram
-    histogram(cluster_id, jobs, percentiles=10, max_width=20, show_fast_jobs=print_list_flag)
+    histogram(cluster_id, arrays, percentiles=10, max_width=20, show_fast_jobs=print_list_flag)
@@ -1,10 +1,25 @@
+import os
+import pickle
+import re
 import sys
 import htcondor2
+import numpy as np
 from difflib import SequenceMatcher
 from tabulate import tabulate
 import argparse
 import datetime
 import time as time_module
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import repeat
+from types import MappingProxyType
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
 
 
 """
@@ -53,6 +68,18 @@ HOLD_REASON_CODES = {
     48: {"label": "HookShadowPrepareJobFailure", "reason": "Prepare job shadow hook failed when it was executed; status code indicated job should be held."}
 }
 
+# Legend rows of the known codes, built once since HOLD_REASON_CODES never changes
+_LEGEND_ROWS = {code: [code, entry["label"], entry["reason"]] for code, entry in HOLD_REASON_CODES.items()}
+
+# Labels of the known codes, indexed by code (codes are small integers); None marks gaps
+_MAX_CODE = max(HOLD_REASON_CODES)
+_LABELS = [HOLD_REASON_CODES[code]["label"] if code in HOLD_REASON_CODES else None for code in range(_MAX_CODE + 1)]
+
+def code_label(code):
+    """Label of a HoldReasonCode, or "Code N" for codes without one"""
+    label = _LABELS[code] if 0 <= code <= _MAX_CODE else None
+    return label or f"Code {code}"
+
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(
@@ -67,6 +94,7 @@ Examples:
     %(prog)s 4641492 --min-count 10 --sort-by time
     %(prog)s 4641492 --top 5 --sort-by percent
     %(prog)s 4641492 --code 34 --threshold 0.8
+    %(prog)s 4641492 --group-templates
     
   Export for bulk operations:
     %(prog)s 4641492 --export-jobs held.txt
@@ -139,6 +167,13 @@ For full list of hold codes, see the output legend or:
              'Default: 0.7. Try 0.8 for stricter or 0.6 for looser grouping. '
              'Example: --threshold 0.8'
     )
+    bucket_group.add_argument(
+        '--group-templates', 
+        action='store_true',
+        help='put reasons that differ only in numbers, paths, case or spacing into '
+             'the same bucket without fuzzy matching. Much faster on clusters with '
+             'many templated messages, but --threshold no longer applies to them'
+    )
     
     # Output options
     output_group = parser.add_argument_group('output options')
@@ -161,31 +196,173 @@ For full list of hold codes, see the output legend or:
     return parser.parse_args()
 
 
+# Seconds a schedd query result is reused before the schedd is asked again
+_QUERY_TTL = 2
+
+# Most schedd query results kept at once; the oldest is evicted beyond this
+_QUERY_CACHE_SIZE = 8
+
+# Distinct reasons, over all codes, from which codes are bucketed in parallel worker processes.
+# This is an unmeasured guess at where bucketing outweighs starting the workers; it has not
+# been timed on a multi-core machine
+_PARALLEL_REASONS = 5000
+
+# Tables with more rows than this are sized from a tabulate preview of their first
+# _PREVIEW_ROWS rows, and the remaining rows are written to stdout in chunks
+_PREVIEW_ROWS = 50
+
+# Rows written per chunk after the preview
+_STREAM_CHUNK = 1000
+
+# Pieces of a hold reason that vary between jobs hitting the same problem, for _canonicalize
+_DIGITS = re.compile(r"\d+")
+_PATHS = re.compile(r"/[^\s'\":,]+")
+_WS = re.compile(r"\s+")
+
+# Number of bins in the character histograms used to bound similarity ratios
+_CHAR_BINS = 128
+
+
+def _char_counts(reason):
+    """Count the characters of a reason, folded into _CHAR_BINS bins"""
+    codes = np.frombuffer(reason.encode("utf-32-le"), dtype=np.uint32)
+    return np.bincount(codes % _CHAR_BINS, minlength=_CHAR_BINS)
+
+
+def _canonicalize(reason):
+    """Reduce a reason to its template: numbers, paths, case and spacing removed"""
+    reason = _DIGITS.sub("0", reason)
+    reason = _PATHS.sub("/P", reason)
+    return _WS.sub(" ", reason.lower()).strip()
+
+
 """
 Groups similar hold reason messages using fuzzy string matching (difflib.SequenceMatcher).
+Each reason joins the first bucket whose representative is similar enough. The characters
+two reasons share bound their ratio from above (as in quick_ratio), so that bound is computed
+against every representative at once and only buckets that could clear the threshold are
+compared in full, reusing one matcher per representative so its lookup tables are built once.
+When rapidfuzz is installed its Indel ratio, which never scores below difflib's, screens the
+remaining candidates first. Matchers run with autojunk off: its popularity heuristic skews
+ratios on long reasons full of repeated boilerplate. A reason seen before goes straight to the
+bucket it went to last time: it scores the same against every earlier representative, so
+first-fit would pick that bucket again. With group_templates, a reason whose template
+(see _canonicalize) matches an earlier reason's joins that reason's bucket without any
+similarity check, which is faster on templated messages but ignores the threshold for them.
 
     Parameters:
-        reason_list (List[Tuple[str, int, int]]): List of (reason, subcode, proc_id) tuples.
+        reasons (Sequence[str]): Hold reasons to group.
         threshold (float): Similarity ratio (between 0 and 1) above which reasons are considered similar.
+        group_templates (bool): Bucket reasons with the same template together directly.
 
     Returns:
-        List[List[Tuple[str, int, int, int]]]: Buckets of (reason, subcode, proc_id, hold_time) tuples.
+        List[List[int]]: Buckets of positions in reasons, each in input order.
 """
-def bucket_reasons_with_data(reason_data, threshold=0.7):
+def _bucket_indices(reasons, threshold=0.7, group_templates=False):
     buckets = []
-    for reason, subcode, proc_id, hold_time in reason_data:
-        placed = False
-        for bucket in buckets:
-            ratio = SequenceMatcher(None, reason, bucket[0][0]).ratio()
+    representatives = []
+    matchers = []
+    cutoff = threshold * 100 - 1e-6
+    rep_counts = np.zeros((16, _CHAR_BINS), dtype=np.int64)
+    rep_lengths = np.zeros(16, dtype=np.int64)
+    seen = {}
+    templates = {}
+    for position, reason in enumerate(reasons):
+        target = seen.get(reason)
+        if target is not None:
+            buckets[target].append(position)
+            continue
+        if group_templates:
+            template = _canonicalize(reason)
+            target = templates.get(template)
+            if target is not None:
+                buckets[target].append(position)
+                seen[reason] = target
+                continue
+
+        counts = _char_counts(reason)
+        n = len(buckets)
+        lengths = rep_lengths[:n] + len(reason)
+        shared = np.minimum(rep_counts[:n], counts).sum(axis=1)
+        bounds = np.where(lengths > 0, 2.0 * shared / np.maximum(lengths, 1), 1.0)
+
+        for i in np.flatnonzero(bounds >= threshold):
+            if reason == representatives[i]:
+                ratio = 1.0
+            else:
+                if fuzz is not None and fuzz.ratio(reason, representatives[i]) < cutoff:
+                    continue
+                matcher = matchers[i]
+                matcher.set_seq1(reason)
+                ratio = matcher.ratio()
             if ratio >= threshold:
-                bucket.append((reason, subcode, proc_id, hold_time))
-                placed = True
+                target = i
                 break
-        if not placed:
-            buckets.append([(reason, subcode, proc_id, hold_time)])
+        if target is None:
+            target = n
+            if n == len(rep_lengths):
+                rep_counts = np.concatenate([rep_counts, np.zeros_like(rep_counts)])
+                rep_lengths = np.concatenate([rep_lengths, np.zeros_like(rep_lengths)])
+            rep_counts[n] = counts
+            rep_lengths[n] = len(reason)
+            representatives.append(reason)
+            matchers.append(SequenceMatcher(None, "", reason, autojunk=False))
+            buckets.append([])
+        buckets[target].append(position)
+
+        # above 1.0 not even an identical reason clears the threshold
+        if threshold <= 1:
+            seen[reason] = target
+        if group_templates:
+            templates.setdefault(template, target)
     return buckets
 
 
+"""
+Groups similar hold reason messages using fuzzy string matching (see _bucket_indices).
+
+    Parameters:
+        reason_list (List[Tuple[str, int, int, int]]): List of (reason, subcode, proc_id, hold_time) tuples.
+        threshold (float): Similarity ratio (between 0 and 1) above which reasons are considered similar.
+        group_templates (bool): Bucket reasons with the same template together directly.
+
+    Returns:
+        List[List[Tuple[str, int, int, int]]]: Buckets of (reason, subcode, proc_id, hold_time) tuples.
+"""
+def bucket_reasons_with_data(reason_data, threshold=0.7, group_templates=False):
+    rows = list(reason_data)
+    buckets = _bucket_indices([row[0] for row in rows], threshold, group_templates)
+    return [[rows[i] for i in bucket] for bucket in buckets]
+
+
+"""
+Buckets the reasons of every HoldReasonCode with _bucket_indices. Codes never share buckets and
+difflib holds the GIL, so with more than one CPU and at least _PARALLEL_REASONS distinct reasons
+the codes are spread over a process pool. Otherwise they run in turn, as they also do when the
+pool raises OSError (workers cannot be started), BrokenProcessPool (a worker died) or
+pickle.PicklingError (_bucket_indices cannot be pickled by reference for the workers).
+
+    Parameters:
+        reasons_by_code (Dict[int, HeldJobs]): Held jobs grouped by HoldReasonCode.
+        threshold (float): Similarity ratio (between 0 and 1) above which reasons are considered similar.
+        group_templates (bool): Bucket reasons with the same template together directly.
+
+    Returns:
+        Dict[int, List[List[int]]]: Maps HoldReasonCode to its buckets of positions in that code's jobs.
+"""
+def _bucket_by_code(reasons_by_code, threshold=0.7, group_templates=False):
+    codes = list(reasons_by_code)
+    reasons = [reasons_by_code[code].reasons for code in codes]
+    workers = min(len(codes), os.cpu_count() or 1)
+    if workers > 1 and sum(len(set(r)) for r in reasons) >= _PARALLEL_REASONS:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return dict(zip(codes, pool.map(_bucket_indices, reasons, repeat(threshold), repeat(group_templates))))
+        except (OSError, BrokenProcessPool, pickle.PicklingError):
+            pass
+    return {code: _bucket_indices(r, threshold, group_templates) for code, r in zip(codes, reasons)}
+
+
 def format_duration(seconds):
     """Format duration in a human-readable way"""
     if seconds < 60:
@@ -202,62 +379,201 @@ def format_duration(seconds):
 
 
 def calculate_avg_hold_time(bucket):
-    """Calculate average time jobs have been held in a bucket"""
+    """Calculate average time jobs have been held in a bucket of (reason, subcode, proc_id, hold_time) tuples"""
+    return _avg_hold_time(np.fromiter((hold_time for _, _, _, hold_time in bucket), dtype=np.float64))
+
+
+def _avg_hold_time(hold_times):
+    """Calculate average time jobs have been held, given their hold timestamps"""
     current_time = time_module.time()
-    hold_durations = []
-    
-    for _, _, _, hold_time in bucket:
-        if hold_time > 0:
-            duration = current_time - hold_time
-            hold_durations.append(duration)
+    hold_times = hold_times[hold_times > 0]
     
-    if not hold_durations:
+    if not hold_times.size:
         return None, "N/A"
     
-    avg_seconds = sum(hold_durations) / len(hold_durations)
+    avg_seconds = float((current_time - hold_times).mean())
     return avg_seconds, format_duration(avg_seconds)
 
 
-""" 
-Queries the HTCondor schedd for held jobs in the specified cluster and groups them by their HoldReasonCode.
-Now also collects ProcId and EnteredCurrentStatus (hold time).
+def _hold_times(reasons_by_code):
+    """Collect the positive hold timestamps of every job into one int64 array"""
+    if not reasons_by_code:
+        return np.zeros(0, dtype=np.int64)
+    hold_times = np.concatenate([jobs.hold_times for jobs in reasons_by_code.values()]).astype(np.int64)
+    return hold_times[hold_times > 0]
+
+
+# columns of the held jobs that share a HoldReasonCode, one entry per job; iterating
+# yields the (HoldReason, HoldReasonSubCode, ProcId, HoldTime) tuples of each job
+@dataclass(frozen=True, eq=False)
+class HeldJobs:
+    reasons: tuple
+    subcodes: np.ndarray
+    proc_ids: np.ndarray
+    hold_times: np.ndarray
+
+    def __post_init__(self):
+        # tables are cached, so keep callers from mutating the shared arrays
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+
+    def __len__(self):
+        return len(self.reasons)
+
+    def __iter__(self):
+        return zip(self.reasons, self.subcodes.tolist(), self.proc_ids.tolist(), self.hold_times.tolist())
+
+    def row(self, i):
+        return self.reasons[i], self.subcodes.item(i), self.proc_ids.item(i), self.hold_times.item(i)
+
+
+def _print_grid(rows, headers):
+    """Print rows as a tabulate "grid" table, streaming large tables after a tabulate preview"""
+    if len(rows) <= _PREVIEW_ROWS:
+        print(tabulate(rows, headers=headers, tablefmt="grid"))
+        return
+
+    # ints are right-aligned and everything else is left-aligned text; number parsing is
+    # off, so a text column is laid out the same way in the preview and in the rest
+    numeric = [all(type(v) is int for v in column) for column in zip(*rows[:_PREVIEW_ROWS])]
+    layout = dict(tablefmt="grid", disable_numparse=True, colalign=["right" if n else "left" for n in numeric])
+    preview = tabulate(rows[:_PREVIEW_ROWS], headers=headers, **layout)
+    rule = preview[:preview.index("\n")]
+    widths = [len(segment) - 2 for segment in rule[1:-1].split("+")]
+
+    # the rest is only streamed if every cell is plain text that fits the preview's columns
+    rest = rows[_PREVIEW_ROWS:]
+    if not all(
+        (type(v) is int and len(str(v)) <= width) if n
+        else (isinstance(v, str) and v.isascii() and v.isprintable() and len(v.strip()) <= width)
+        for row in rest
+        for v, width, n in zip(row, widths, numeric)
+    ):
+        print(tabulate(rows, headers=headers, **layout))
+        return
+
+    sys.stdout.write(preview + "\n")
+    lines = []
+    for row in rest:
+        cells = (str(v).rjust(width) if n else v.strip().ljust(width) for v, width, n in zip(row, widths, numeric))
+        lines.append("| " + " | ".join(cells) + " |")
+        lines.append(rule)
+        if len(lines) >= 2 * _STREAM_CHUNK:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines = []
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+# one record per held job, in the order iter_held_jobs yields its fields
+_HELD_JOB_DTYPE = np.dtype([
+    ("code", np.int64), ("reason", object), ("subcode", np.int64), ("proc_id", np.int64), ("hold_time", np.int64),
+])
+
+
+"""
+Yields the held jobs of the specified cluster one at a time, straight from the schedd query.
 
     Parameters:
         cluster_id (str or int): The ID of the cluster to analyze.
 
-    Returns:
-        Dict[int, List[Tuple[str, int, int, int]]]: Maps HoldReasonCode to list of 
-                                                      (HoldReason, HoldReasonSubCode, ProcId, HoldTime) tuples.
+    Yields:
+        Tuple[int, str, int, int, int]: (HoldReasonCode, HoldReason, HoldReasonSubCode, ProcId, HoldTime)
 """
-def group_by_code(cluster_id):
+def iter_held_jobs(cluster_id):
     schedd = htcondor2.Schedd()
-    reasons_by_code = {}
 
-    print("Fetching held jobs from cluster...", file=sys.stderr)
-    
     for ad in schedd.query(
         constraint=f"ClusterId == {cluster_id} && JobStatus == 5",
         projection=["ProcId", "HoldReasonCode", "HoldReason", "HoldReasonSubCode", "EnteredCurrentStatus"],
         limit=-1
     ):
-        code = ad.eval("HoldReasonCode")
-        subcode = ad.eval("HoldReasonSubCode")
-        proc_id = ad.eval("ProcId")
+        # Plain attribute lookups; these are literals, so there is nothing for eval() to evaluate
+        code = ad["HoldReasonCode"]
+        subcode = ad.get("HoldReasonSubCode", 0)
+        proc_id = ad["ProcId"]
         hold_time = ad.get("EnteredCurrentStatus", 0)
 
         # Displaying only the first line of HoldReason, to bucket more efficiently
-        reason = ad.eval("HoldReason").split('. ')[0]
-        if "Error from" in reason and ": " in reason:
-            parts = reason.split(": ", 1)
-            if len(parts) == 2:
-                reason = parts[1]
+        reason = ad.get("HoldReason", "").partition('. ')[0]
+        if "Error from" in reason:
+            _, sep, message = reason.partition(": ")
+            if sep:
+                reason = message
+
+        # Hold reasons repeat heavily, so keep a single copy of each distinct one
+        reason = sys.intern(reason)
+
+        yield code, reason, subcode, proc_id, hold_time
+
+
+""" 
+Queries the HTCondor schedd for held jobs in the specified cluster and groups them by their HoldReasonCode.
+Now also collects ProcId and EnteredCurrentStatus (hold time).
 
-        reasons_by_code.setdefault(code, []).append((reason, subcode, proc_id, hold_time))
+    Parameters:
+        cluster_id (str or int): The ID of the cluster to analyze.
 
-    print(f"Found {sum(len(v) for v in reasons_by_code.values())} held jobs\n", file=sys.stderr)
+    Returns:
+        Dict[int, HeldJobs]: Maps HoldReasonCode to the columns of its held jobs
+                             (HoldReason, HoldReasonSubCode, ProcId, HoldTime).
+"""
+def group_by_code(cluster_id):
+    print("Fetching held jobs from cluster...", file=sys.stderr)
+
+    # the generator is drained straight into one structured array, a column per field
+    jobs = np.fromiter(iter_held_jobs(cluster_id), dtype=_HELD_JOB_DTYPE)
+    print(f"Found {len(jobs)} held jobs\n", file=sys.stderr)
+    if not len(jobs):
+        return {}
+
+    codes, reasons, subcodes, proc_ids, hold_times = (jobs[name] for name in _HELD_JOB_DTYPE.names)
+
+    # split the rows by code with one stable argsort, listing codes in the order they
+    # were first seen; every column, reasons included, is then gathered by index array
+    order = np.argsort(codes, kind="stable")
+    values, first, counts = np.unique(codes, return_index=True, return_counts=True)
+    groups = np.split(order, np.cumsum(counts)[:-1])
+
+    reasons_by_code = {}
+    for g in np.argsort(first, kind="stable"):
+        idx = groups[g]
+        reasons_by_code[values.item(g)] = HeldJobs(
+            tuple(reasons[idx].tolist()), subcodes[idx], proc_ids[idx], hold_times[idx]
+        )
     return reasons_by_code
 
 
+# cluster_id -> (time.monotonic() of the query, its grouped result), oldest query first
+_query_cache = {}
+
+
+# returns group_by_code(cluster_id), reusing the result of a query made within the last _QUERY_TTL seconds
+def group_by_code_cached(cluster_id):
+    key = str(cluster_id)
+    now = time_module.monotonic()
+
+    # entries are kept in query order, so the expired ones are all at the front
+    while _query_cache:
+        oldest = next(iter(_query_cache))
+        if now - _query_cache[oldest][0] < _QUERY_TTL:
+            break
+        del _query_cache[oldest]
+
+    entry = _query_cache.get(key)
+    if entry is not None:
+        return entry[1]
+
+    result = MappingProxyType(group_by_code(cluster_id))
+    # stamped once the query has finished, so a slow query still gets its full TTL
+    _query_cache[key] = (time_module.monotonic(), result)
+    if len(_query_cache) > _QUERY_CACHE_SIZE:
+        del _query_cache[next(iter(_query_cache))]
+    return result
+
+
 """
 Analyzes and prints time-based statistics for held jobs.
 
@@ -265,16 +581,14 @@ Analyzes and prints time-based statistics for held jobs.
         reasons_by_code (Dict): Dictionary grouping hold reasons by HoldReasonCode.
 """
 def print_time_analysis(reasons_by_code):
-    all_times = []
-    for pairs in reasons_by_code.values():
-        all_times.extend([hold_time for _, _, _, hold_time in pairs if hold_time > 0])
+    all_times = _hold_times(reasons_by_code)
     
-    if not all_times:
+    if not all_times.size:
         print("⏱️  Time Analysis: No timestamp data available\n")
         return
     
-    earliest = min(all_times)
-    latest = max(all_times)
+    earliest = all_times.min().item()
+    latest = all_times.max().item()
     current_time = time_module.time()
     
     print("⏱️  Time Analysis:")
@@ -284,52 +598,50 @@ def print_time_analysis(reasons_by_code):
     print(f"  Duration:   {duration_hours:.1f} hours")
     
     # Calculate overall average hold time
-    avg_hold_duration = (current_time - sum(all_times) / len(all_times))
+    avg_hold_duration = (current_time - all_times.sum().item() / all_times.size)
     print(f"  Avg hold:   {format_duration(avg_hold_duration)}")
     
     print()
 
 
+@lru_cache(maxsize=32)
+def _legend_table(codes):
+    """Render the legend for the given sorted codes; runs usually see the same few codes"""
+    legend = [_LEGEND_ROWS.get(code, [code, "Unknown", "No description available."]) for code in codes]
+    return tabulate(legend, headers=["Code", "Label", "Reason"], tablefmt="fancy_grid")
+
+
 """
 Export job IDs with hold reason codes to a CSV file for bulk operations.
 
     Parameters:
-        all_buckets (List): All buckets with job data.
+        all_buckets (List[np.ndarray]): ProcIds of the jobs in each bucket.
         reasons_by_code (Dict): Dictionary mapping codes to job data.
         cluster_id (str): The cluster ID.
         filename (str): Output filename.
 """
 def export_job_ids(all_buckets, reasons_by_code, cluster_id, filename):
-    import csv
-    
-    # Build a mapping of proc_id to hold reason code
-    proc_to_code = {}
-    for code, pairs in reasons_by_code.items():
-        for _, _, proc_id, _ in pairs:
-            proc_to_code[proc_id] = code
-    
-    # Collect job IDs with their codes
-    job_data = []
-    seen_jobs = set()
-    for bucket in all_buckets:
-        for _, _, proc_id, _ in bucket:
-            job_id = f"{cluster_id}.{proc_id}"
-            if job_id not in seen_jobs:
-                seen_jobs.add(job_id)
-                hold_code = proc_to_code.get(proc_id, "Unknown")
-                hold_label = HOLD_REASON_CODES.get(hold_code, {}).get("label", f"Code {hold_code}")
-                job_data.append((job_id, hold_code, hold_label))
-    
-    # Sort by job ID for consistency
-    job_data.sort(key=lambda x: (int(x[0].split('.')[0]), int(x[0].split('.')[1])))
-    
-    # Write to CSV
-    with open(filename, "w", newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["JobID", "HoldReasonCode", "HoldReasonLabel"])
-        writer.writerows(job_data)
-    
-    print(f"✓ Exported {len(job_data)} unique job IDs to {filename}\n")
+    # Build a mapping of proc_id to hold reason code; ProcIds within a cluster are
+    # small dense integers, so an array indexed by ProcId holds it
+    max_proc = max((int(jobs.proc_ids.max()) for jobs in reasons_by_code.values()), default=-1)
+    proc_to_code = np.zeros(max_proc + 1, dtype=np.int64)
+    for code, jobs in reasons_by_code.items():
+        proc_to_code[jobs.proc_ids] = code
+    
+    # Collect job IDs with their codes, sorted by ProcId for consistency; every job
+    # sits in exactly one bucket, so there are no duplicates to drop
+    proc_ids = np.sort(np.concatenate(all_buckets)) if all_buckets else np.zeros(0, dtype=np.int64)
+    hold_codes = proc_to_code[proc_ids]
+    labels = {code: code_label(code) for code in np.unique(hold_codes).tolist()}
+    lines = ["JobID,HoldReasonCode,HoldReasonLabel"]
+    for proc_id, hold_code in zip(proc_ids.tolist(), hold_codes.tolist()):
+        lines.append(f"{cluster_id}.{proc_id},{hold_code},{labels[hold_code]}")
+    
+    # Write the CSV in one go, with the \r\n row endings of the csv module's default dialect
+    with open(filename, "w", newline='', buffering=1 << 20) as f:
+        f.write("\r\n".join(lines) + "\r\n")
+    
+    print(f"✓ Exported {proc_ids.size} unique job IDs to {filename}\n")
 
 """ 
 Processes grouped hold reasons and prints a detailed table with filtering and sorting options.
@@ -342,7 +654,7 @@ Processes grouped hold reasons and prints a detailed table with filtering and so
 def bucket_and_print_table(reasons_by_code, cluster_id, args):
     print(f"Cluster ID: {cluster_id}")
 
-    held_jobs = sum(len(pairs) for pairs in reasons_by_code.values())
+    held_jobs = sum(len(jobs) for jobs in reasons_by_code.values())
     print(f"Held Jobs in Cluster: {held_jobs}\n")
     
     # Time analysis
@@ -359,60 +671,63 @@ def bucket_and_print_table(reasons_by_code, cluster_id, args):
             return
         reasons_by_code = {args.code: reasons_by_code[args.code]}
 
-    for code, pairs in reasons_by_code.items():
-        label = HOLD_REASON_CODES.get(code, {}).get("label", f"Code {code}")
+    buckets_by_code = _bucket_by_code(reasons_by_code, threshold=args.threshold, group_templates=args.group_templates)
+    for code, jobs in reasons_by_code.items():
+        label = code_label(code)
         seen_codes.add(code)
-        buckets = bucket_reasons_with_data(pairs, threshold=args.threshold)
+        buckets = buckets_by_code[code]
         
         for bucket in buckets:
             # Apply min-count filter
             if len(bucket) < args.min_count:
                 continue
                 
-            all_buckets.append(bucket)
-            example_reason, subcode, proc_id, hold_time = bucket[0]
+            proc_ids = jobs.proc_ids[bucket]
+            all_buckets.append(proc_ids)
+            example_reason, subcode, proc_id, hold_time = jobs.row(bucket[0])
             percent = (len(bucket) / held_jobs) * 100 if held_jobs > 0 else 0
             
             # Calculate average hold time for this bucket
-            avg_hold_seconds, avg_hold_str = calculate_avg_hold_time(bucket)
+            avg_hold_seconds, avg_hold_str = _avg_hold_time(jobs.hold_times[bucket])
             
             # Prepare job IDs string if requested
             job_ids_str = ""
             if args.show_job_ids:
                 if len(bucket) <= 5:
-                    ids = [str(p) for _, _, p, _ in bucket]
+                    ids = [str(p) for p in proc_ids.tolist()]
                     job_ids_str = ", ".join(ids)
                 else:
-                    ids = [str(p) for _, _, p, _ in bucket[:3]]
+                    ids = [str(p) for p in proc_ids[:3].tolist()]
                     job_ids_str = f"{', '.join(ids)}... (+{len(bucket)-3} more)"
             
+            count = len(bucket)
             row = [
                 label, 
                 subcode, 
-                f"{percent:.1f}% ({len(bucket)})", 
+                f"{percent:.1f}% ({count})", 
                 avg_hold_str,
                 example_reason
             ]
             if args.show_job_ids:
                 row.append(job_ids_str)
             
-            # Store avg_hold_seconds for sorting
-            row.append(avg_hold_seconds if avg_hold_seconds else 0)
+            # Store count, displayed percent and avg_hold_seconds for sorting
+            row.extend((count, round(percent, 1), avg_hold_seconds if avg_hold_seconds else 0))
             
             example_rows.append(row)
 
     # Sort results
     if args.sort_by == 'count':
-        example_rows.sort(key=lambda x: int(x[2].split('(')[1].split(')')[0]), reverse=True)
+        example_rows.sort(key=lambda x: x[-3], reverse=True)
     elif args.sort_by == 'code':
         example_rows.sort(key=lambda x: x[0])
     elif args.sort_by == 'percent':
-        example_rows.sort(key=lambda x: float(x[2].split('%')[0]), reverse=True)
+        example_rows.sort(key=lambda x: x[-2], reverse=True)
     elif args.sort_by == 'time':
         example_rows.sort(key=lambda x: x[-1], reverse=True)  # Sort by avg_hold_seconds
     
-    # Remove the avg_hold_seconds column (used only for sorting)
-    example_rows = [row[:-1] for row in example_rows]
+    # Remove the sort columns
+    example_rows = [row[:-3] for row in example_rows]
     
     # Apply top N filter
     if args.top:
@@ -422,30 +737,29 @@ def bucket_and_print_table(reasons_by_code, cluster_id, args):
     if args.show_job_ids:
         headers.append("Job IDs (ProcId)")
     
-    print(tabulate(example_rows, headers=headers, tablefmt="grid"))
+    _print_grid(example_rows, headers)
 
     print("\nLegend:")
-    legend = []
-    for code in sorted(seen_codes):
-        entry = HOLD_REASON_CODES.get(code, {})
-        legend.append([code, entry.get("label", "Unknown"), entry.get("reason", "No description available.")])
-    print(tabulate(legend, headers=["Code", "Label", "Reason"], tablefmt="fancy_grid"))
+    print(_legend_table(tuple(sorted(seen_codes))))
     
 
     # Export job IDs if requested
     if args.export_jobs:
         export_job_ids(all_buckets, reasons_by_code, cluster_id, args.export_jobs)
 
-def get_hold_bucket_data(cluster_id, threshold=0.7):
+def get_hold_bucket_data(cluster_id, threshold=0.7, reasons_by_code=None, group_templates=False):
     """
     Return held jobs analysis data as a dictionary for use by cluster_health.py
     Does not print anything, just returns computed metrics.
+    Pass reasons_by_code from an earlier group_by_code call to skip the schedd query;
+    otherwise a query made in the last few seconds is reused.
     
     Returns:
         dict: Dictionary containing held jobs analysis
     """
     try:
-        reasons_by_code = group_by_code(cluster_id)
+        if reasons_by_code is None:
+            reasons_by_code = group_by_code_cached(cluster_id)
         
         if not reasons_by_code:
             return {
@@ -456,14 +770,15 @@ def get_hold_bucket_data(cluster_id, threshold=0.7):
                 "buckets": [],
             }
         
-        held_count = sum(len(pairs) for pairs in reasons_by_code.values())
+        held_count = sum(len(jobs) for jobs in reasons_by_code.values())
         held_codes = {}
         all_buckets = []
         
-        for code, pairs in reasons_by_code.items():
-            held_codes[code] = len(pairs)
-            buckets = bucket_reasons_with_data(pairs, threshold=threshold)
-            all_buckets.extend(buckets)
+        buckets_by_code = _bucket_by_code(reasons_by_code, threshold=threshold, group_templates=group_templates)
+        for code, jobs in reasons_by_code.items():
+            held_codes[code] = len(jobs)
+            buckets = buckets_by_code[code]
+            all_buckets.extend([jobs.row(i) for i in bucket] for bucket in buckets)
         
         # Get top reasons
         held_reasons = {}
@@ -472,17 +787,14 @@ def get_hold_bucket_data(cluster_id, threshold=0.7):
             held_reasons[reason] = len(bucket)
         
         # Time analysis
-        all_times = []
-        for pairs in reasons_by_code.values():
-            all_times.extend([hold_time for _, _, _, hold_time in pairs if hold_time > 0])
+        all_times = _hold_times(reasons_by_code)
         
         time_stats = {}
-        if all_times:
-            import time as time_module
+        if all_times.size:
             current_time = time_module.time()
-            earliest = min(all_times)
-            latest = max(all_times)
-            avg_hold_duration = (current_time - sum(all_times) / len(all_times))
+            earliest = all_times.min().item()
+            latest = all_times.max().item()
+            avg_hold_duration = (current_time - all_times.sum().item() / all_times.size)
             
             time_stats = {
                 "first_held": earliest,
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+
+
+# CSV fallback reader, used when neither pyarrow nor pandas is installed
+class CsvFallbackReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        for name, value in (("pd", None), ("pa", None), ("_DATA_DIR", self.tmpdir.name)):
+            patcher = mock.patch.object(analytics, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        analytics._compute_metrics_cached.cache_clear()
+        self.addCleanup(analytics._compute_metrics_cached.cache_clear)
+
+    def write_csv(self, cluster_id, text):
+        path = os.path.join(self.tmpdir.name, f"cluster_{cluster_id}_jobs.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_single_column_keeps_blank_rows_aligned(self):
+        path = self.write_csv(1, "ClusterId,RequestMemory\n1,\n1,2048\n1,\n1,4096\n")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            columns = analytics._read_jobs(path)
+
+        np.testing.assert_array_equal(columns["RequestMemory"], [np.nan, 2048.0, np.nan, 4096.0])
+        self.assertEqual(len(columns["RequestDisk"]), 4)
+        self.assertTrue(np.isnan(columns["RequestDisk"]).all())
+
+    def test_single_blank_column_gives_no_requests(self):
+        self.write_csv(2, "ClusterId,RequestMemory\n2,\n2,\n")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            metrics = analytics._compute_metrics(2)
+
+        self.assertEqual(len(metrics.mem_requested), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
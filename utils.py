@@ -1,4 +1,12 @@
 import htcondor2
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# JobStatus values 1-7, in order
+JOB_STATES = [
+    "Idle", "Running", "Removing", "Completed",
+    "Held", "Transferring Output", "Suspended"
+]
 
 def safe_float(val):
     try:
@@ -6,21 +14,23 @@ def safe_float(val):
     except (ValueError, TypeError):
         return None
 
-def fetch_schedd_data(clusterId):
-    schedd = htcondor2.Schedd()
-    counts = { state: 0 for state in job_states }
-    # history (finished jobs)
-    for ad in schedd.history(
-            constraint = f"ClusterId == {clusterId}",
-            projection = ["JobStatus"],
-            match = -1
-        ):
-        counts[job_states[ad.eval("JobStatus")-1]] += 1
-    # queue (running / pending jobs)
-    for ad in schedd.query(
+# counts the ads of one schedd listing ("history" or "query") by JobStatus
+def _count_statuses(method, clusterId, **kwargs):
+    ads = getattr(htcondor2.Schedd(), method)(
             constraint = f"ClusterId == {clusterId}",
             projection = ["JobStatus"],
-            limit = -1
-        ):
-        counts[job_states[ad.eval("JobStatus")-1]] += 1
-    return counts
\ No newline at end of file
+            **kwargs
+        )
+    return Counter(ad["JobStatus"] for ad in ads)
+
+def fetch_schedd_data(clusterId):
+    # history (finished jobs) and queue (running / pending jobs) are fetched at the same time
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        history = pool.submit(_count_statuses, "history", clusterId, match = -1)
+        queue = pool.submit(_count_statuses, "query", clusterId, limit = -1)
+        totals = history.result() + queue.result()
+
+    counts = { state: 0 for state in JOB_STATES }
+    for status, count in totals.items():
+        counts[JOB_STATES[status-1]] += count
+    return counts